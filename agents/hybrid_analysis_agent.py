@@ -1,7 +1,8 @@
 import json
 import logging
 import asyncio
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 import os
 
 # ADK imports
@@ -25,6 +26,21 @@ except ImportError:
     keras = None
     LOCAL_ML_AVAILABLE = False
 
+# Local Keras model, loaded once per process; neither loading nor predict()
+# is thread-safe, so analyses in worker threads share one instance behind a lock
+LOCAL_MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "models", "fraud_detection_model.keras")
+_local_model_lock = threading.Lock()
+_local_model = None
+
+def _get_local_model() -> Optional[Any]:
+    """Return the shared local model, loading it on first use (None if the file is missing)."""
+    global _local_model
+    if _local_model is None:
+        with _local_model_lock:
+            if _local_model is None and os.path.exists(LOCAL_MODEL_PATH):
+                _local_model = keras.models.load_model(LOCAL_MODEL_PATH)
+    return _local_model
+
 def analyze_transaction_risk(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze a transaction for fraud risk using Gemini AI.
@@ -135,10 +151,10 @@ def analyze_transaction_local(transaction_data: Dict[str, Any]) -> Dict[str, Any
                 "analysis_summary": "Fallback analysis - TensorFlow unavailable"
             }
         
-        # Load the local model
-        model_path = os.path.join(os.path.dirname(__file__), "..", "models", "fraud_detection_model.keras")
+        # Shared local model, loaded once
+        model = _get_local_model()
         
-        if not os.path.exists(model_path):
+        if model is None:
             return {
                 "risk_score": 0.5,
                 "analysis_method": "model_missing",
@@ -147,9 +163,6 @@ def analyze_transaction_local(transaction_data: Dict[str, Any]) -> Dict[str, Any
                 "analysis_summary": "Local model not available"
             }
         
-        # Load model
-        model = keras.models.load_model(model_path)
-        
         # Extract features (assuming V1-V28 feature format)
         features = transaction_data.get('features', {})
         feature_vector = []
@@ -168,7 +181,8 @@ def analyze_transaction_local(transaction_data: Dict[str, Any]) -> Dict[str, Any
         
         # Make prediction
         feature_array = np.array([feature_vector])
-        prediction = model.predict(feature_array, verbose=0)[0][0]
+        with _local_model_lock:
+            prediction = model.predict(feature_array, verbose=0)[0][0]
         
         # Convert to risk score
         risk_score = float(prediction)
@@ -320,8 +334,9 @@ class HybridAnalysisAgent:
         try:
             self._total_analyzed += 1
             
-            # Use the hybrid analysis tool
-            analysis_result = hybrid_risk_analysis(transaction_data, self.ai_threshold)
+            # Use the hybrid analysis tool; its ML inference and Gemini calls are
+            # blocking, so they run in a worker thread to keep the event loop free
+            analysis_result = await asyncio.to_thread(hybrid_risk_analysis, transaction_data, self.ai_threshold)
             
             # Track which method was used
             if "ai" in analysis_result.get("analysis_method", ""):
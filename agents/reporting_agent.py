@@ -12,9 +12,25 @@ This agent handles data warehousing and analytics integration:
 import json
 import logging
 import asyncio
-from typing import AsyncGenerator, Dict, Any, List
-from datetime import datetime, timedelta
+import concurrent.futures
+import hashlib
+import io
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import AsyncGenerator, Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
 import os
+import sys
+
+# Use libuv's event loop when available; asyncio APIs work unchanged on it
+if sys.platform != "win32":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # uvloop not installed, use the default asyncio event loop
 
 # Load environment variables from .env file if it exists
 try:
@@ -32,13 +48,664 @@ from google.genai import types
 
 # Google Cloud imports
 from google.cloud import pubsub_v1
+from google.cloud.pubsub_v1.publisher.exceptions import FlowControlLimitError
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
+from google.api_core import exceptions as api_exceptions
+
+# Optional orjson for faster row serialization on the streaming path
+try:
+    import orjson
+    
+    def _dumps_bytes(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps_bytes(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return json.dumps(obj, default=str).encode('utf-8')
+    
+    _loads = json.loads
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string."""
+    return _dumps_bytes(obj).decode('utf-8')
+
+def _preview(obj: Any, limit: int = 200) -> str:
+    """
+    JSON preview of obj cut to limit characters.
+    
+    Dicts are serialized one item at a time, stopping once the limit is
+    reached, and long strings are cut first, so a large record is not fully
+    serialized just to log its first few hundred characters.
+    """
+    if not isinstance(obj, dict):
+        return _dumps(obj)[:limit]
+    parts = []
+    length = 1
+    for key, value in obj.items():
+        if isinstance(value, str) and len(value) > limit:
+            value = value[:limit]
+        part = f"{_dumps(str(key))}:{_dumps(value)}"
+        parts.append(part)
+        length += len(part) + 1
+        if length >= limit:
+            break
+    return ("{" + ",".join(parts) + "}")[:limit]
+
+# Optional BigQuery Storage Write API support (google-cloud-bigquery-storage)
+try:
+    from google.cloud import bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import types as storage_types
+    from google.cloud.bigquery_storage_v1 import writer as storage_writer
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+    STORAGE_WRITE_AVAILABLE = True
+except ImportError:
+    bigquery_storage_v1 = None
+    STORAGE_WRITE_AVAILABLE = False
+
+# Optional pyarrow for columnar query result transfer
+try:
+    import pyarrow  # noqa: F401 - required by RowIterator.to_arrow()
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# BigQuery streaming insert limits: chunks stay under the 10 MB / 50k-row
+# per-request quota (BigQuery recommends at most 500 rows per request)
+DEFAULT_STREAMING_MAX_ROWS = int(os.environ.get("BQ_CHUNK_SIZE", "500"))
+STREAMING_MAX_ROWS_LIMIT = 10000
+DEFAULT_STREAMING_MAX_BYTES = 9 * 1024 * 1024
+# Upper bound on concurrent insert_rows_json HTTPS requests per agent
+DEFAULT_MAX_CONCURRENT_INSERTS = int(os.environ.get("BQ_CONCURRENCY", "8"))
+# Per-message rows are coalesced per table and flushed when a batch fills
+# up or after the max latency, whichever comes first
+DEFAULT_BATCH_MAX_ROWS = 500
+DEFAULT_BATCH_MAX_LATENCY_MS = 200
+# Bulk, append-only tables are written with NDJSON load jobs instead of
+# streaming; the interval keeps well under 1,500 load jobs per table per day
+DEFAULT_LOAD_JOB_TABLES = ("transactions",)
+DEFAULT_LOAD_BATCH_ROWS = 10000
+DEFAULT_LOAD_INTERVAL_SECONDS = 120
+# Messages are nacked (redelivered later) while a table's buffered rows
+# exceed this many serialized bytes, so a slow BigQuery throttles intake
+DEFAULT_PENDING_HIGH_WATER_BYTES = 32 * 1024 * 1024
+
+# Insert failures worth retrying; other 4xx errors are permanent
+TRANSIENT_BIGQUERY_ERRORS = (
+    api_exceptions.TooManyRequests,
+    api_exceptions.InternalServerError,
+    api_exceptions.BadGateway,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.GatewayTimeout,
+)
+
+# Transport-level failures (dropped connections, timeouts) that never
+# reached BigQuery and are safe to retry with the same insertIds
+TRANSIENT_TRANSPORT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    api_exceptions.RetryError,
+)
+
+# Base retry delays in seconds, indexed by attempt; each is scaled by a
+# random factor in [0.5, 1.5) so concurrent retries do not synchronize
+BACKOFF_DELAYS = (1, 2, 4, 8)
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an insert failure is transient (429/5xx or a transport error)."""
+    return isinstance(error, TRANSIENT_BIGQUERY_ERRORS + TRANSIENT_TRANSPORT_ERRORS)
+
+def _backoff_delay(retry_count: int) -> float:
+    """Jittered backoff delay before the given 1-based retry attempt."""
+    return BACKOFF_DELAYS[min(max(retry_count - 1, 0), len(BACKOFF_DELAYS) - 1)] * (0.5 + random.random())
+
+# Column used as the streaming insertId per table, so retried chunks are
+# de-duplicated by BigQuery instead of producing duplicate rows
+ROW_ID_FIELDS = {
+    "transactions": "transaction_id",
+    "analysis_results": "analysis_id",
+    "alerts": "alert_id",
+    "reports": "report_id",
+}
+
+# Failed rows are appended as NDJSON to one rolling file per table here
+RECOVERY_DIR = "recovery"
+# Dead-letter messages are split to stay under Pub/Sub's 10 MB message limit
+DLQ_MAX_MESSAGE_BYTES = 8 * 1024 * 1024
+
+# Upper bound on waiting for subscriptions to come up before reporting
+SUBSCRIPTION_READY_TIMEOUT = 2.0
+
+# Process-wide Pub/Sub clients so every ReportingAgent shares the same gRPC
+# channels; they are refcounted and shut down when the last agent stops. Publisher flow control bounds outstanding report messages and
+# fails fast instead of blocking the event loop inside publish(), and batch
+# settings coalesce reports published close together into one request.
+PUBLISHER_BATCH_SETTINGS = pubsub_v1.types.BatchSettings(
+    max_messages=100,
+    max_bytes=1_000_000,
+    max_latency=0.1,
+)
+PUBLISH_TIMEOUT_SECONDS = 30
+PUBLISHER_OPTIONS = pubsub_v1.types.PublisherOptions(
+    flow_control=pubsub_v1.types.PublishFlowControl(
+        message_limit=1000,
+        byte_limit=10 * 1024 * 1024,
+        limit_exceeded_behavior=pubsub_v1.types.LimitExceededBehavior.ERROR,
+    )
+)
+
+_pubsub_lock = threading.Lock()
+_publisher_client: Optional[pubsub_v1.PublisherClient] = None
+_subscriber_client: Optional[pubsub_v1.SubscriberClient] = None
+_pubsub_refcount = 0
+
+def _acquire_pubsub_clients() -> Tuple[pubsub_v1.PublisherClient, pubsub_v1.SubscriberClient]:
+    """Register a user of the shared clients and return (publisher, subscriber)."""
+    global _publisher_client, _subscriber_client, _pubsub_refcount
+    # Create and count under one lock so a concurrent release cannot close
+    # the clients between creation and registration
+    with _pubsub_lock:
+        if _publisher_client is None:
+            _publisher_client = pubsub_v1.PublisherClient(
+                batch_settings=PUBLISHER_BATCH_SETTINGS,
+                publisher_options=PUBLISHER_OPTIONS,
+            )
+        if _subscriber_client is None:
+            _subscriber_client = pubsub_v1.SubscriberClient()
+        _pubsub_refcount += 1
+        return _publisher_client, _subscriber_client
+
+def _release_pubsub_clients() -> None:
+    """
+    Drop a user of the shared clients; shut them down when the last one leaves.
+    
+    Stopping the publisher blocks until its outstanding messages are sent and
+    their callbacks have run, so async callers run this in a worker thread.
+    """
+    global _publisher_client, _subscriber_client, _pubsub_refcount
+    with _pubsub_lock:
+        _pubsub_refcount = max(_pubsub_refcount - 1, 0)
+        if _pubsub_refcount > 0:
+            return
+        publisher, subscriber = _publisher_client, _subscriber_client
+        _publisher_client = None
+        _subscriber_client = None
+    try:
+        if publisher is not None:
+            publisher.stop()
+        if subscriber is not None:
+            subscriber.close()
+    except Exception as e:
+        logger.warning(f"Error shutting down Pub/Sub clients: {e}")
+
+# Known JSON keys promoted to typed columns so queries avoid JSON parsing;
+# anything else stays in the residual features/metrics JSON column
+FEATURE_COLUMNS = {f"V{i}": f"feat_v{i}" for i in range(1, 29)}
+METRIC_COLUMNS = {
+    "total_transactions": ("metric_total_transactions", "INTEGER"),
+    "high_risk_count": ("metric_high_risk_count", "INTEGER"),
+    "medium_risk_count": ("metric_medium_risk_count", "INTEGER"),
+    "low_risk_count": ("metric_low_risk_count", "INTEGER"),
+    "avg_risk_score": ("metric_avg_risk_score", "FLOAT64"),
+    "avg_processing_time": ("metric_avg_processing_time", "FLOAT64"),
+    "fraud_detection_rate": ("metric_fraud_detection_rate", "FLOAT64"),
+    "false_positive_rate": ("metric_false_positive_rate", "FLOAT64"),
+}
+
+def _split_typed_columns(values: Dict[str, Any], columns: Dict[str, str]):
+    """
+    Split a JSON-style dict into typed column values and a residual dict.
+    
+    Returns:
+        Tuple of ({column: value} for known numeric keys, {key: value} for the rest)
+    """
+    typed = {}
+    residual = {}
+    for key, value in values.items():
+        column = columns.get(key)
+        if column is not None and isinstance(value, (int, float)):
+            typed[column] = value
+        else:
+            residual[key] = value
+    return typed, residual
+
+# Table schemas, built once and shared by table creation and streaming
+TRANSACTIONS_SCHEMA = (
+    bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("timestamp", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("amount", "FLOAT64", mode="REQUIRED"),
+    bigquery.SchemaField("merchant", "STRING", mode="NULLABLE"),
+    bigquery.SchemaField("location", "STRING", mode="NULLABLE"),
+    bigquery.SchemaField("card_type", "STRING", mode="NULLABLE"),
+    bigquery.SchemaField("features", "JSON", mode="NULLABLE"),
+    bigquery.SchemaField("processed_at", "TIMESTAMP", mode="REQUIRED"),
+) + tuple(
+    bigquery.SchemaField(column, "FLOAT64", mode="NULLABLE")
+    for column in FEATURE_COLUMNS.values()
+)
+
+ANALYSIS_RESULTS_SCHEMA = (
+    bigquery.SchemaField("analysis_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("analysis_method", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("risk_score", "FLOAT64", mode="REQUIRED"),
+    bigquery.SchemaField("risk_level", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("fraud_indicators", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("recommendations", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("analysis_summary", "STRING", mode="NULLABLE"),
+    bigquery.SchemaField("confidence_score", "FLOAT64", mode="NULLABLE"),
+    bigquery.SchemaField("processing_time_ms", "INTEGER", mode="NULLABLE"),
+    bigquery.SchemaField("analyzed_at", "TIMESTAMP", mode="REQUIRED"),
+)
+
+ALERTS_SCHEMA = (
+    bigquery.SchemaField("alert_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("priority", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("urgency", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("alert_type", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("notification_channels", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("alert_status", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("acknowledged_by", "STRING", mode="NULLABLE"),
+    bigquery.SchemaField("resolution_notes", "STRING", mode="NULLABLE"),
+    bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("resolved_at", "TIMESTAMP", mode="NULLABLE"),
+)
+
+REPORTS_SCHEMA = (
+    bigquery.SchemaField("report_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("report_type", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("report_period", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("metrics", "JSON", mode="REQUIRED"),
+    bigquery.SchemaField("insights", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("recommendations", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("data_quality_score", "FLOAT64", mode="NULLABLE"),
+    bigquery.SchemaField("generated_at", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("report_url", "STRING", mode="NULLABLE"),
+) + tuple(
+    bigquery.SchemaField(column, field_type, mode="NULLABLE")
+    for column, field_type in METRIC_COLUMNS.values()
+)
+
+_METRIC_COLUMN_NAMES = {key: column for key, (column, _) in METRIC_COLUMNS.items()}
+
+SCHEMAS_BY_TABLE_TYPE = {
+    "transactions": TRANSACTIONS_SCHEMA,
+    "analysis_results": ANALYSIS_RESULTS_SCHEMA,
+    "alerts": ALERTS_SCHEMA,
+    "reports": REPORTS_SCHEMA,
+}
+
+# Daily-summary query. @today is a DATE query parameter so the query text is
+# stable across calls (eligible for BigQuery's cached results), and the
+# half-open analyzed_at range lets BigQuery prune by partition. Aggregates and
+# top indicators come from a single scan: flagged indicators are collected with
+# ARRAY_CONCAT_AGG and ranked from that array rather than re-reading the table.
+DAILY_SUMMARY_SQL = """
+SELECT
+    total_transactions,
+    high_risk_count,
+    medium_risk_count,
+    low_risk_count,
+    avg_risk_score,
+    avg_processing_time,
+    ARRAY(
+        SELECT fraud_indicator
+        FROM UNNEST(flagged_indicators) AS fraud_indicator
+        GROUP BY fraud_indicator
+        ORDER BY COUNT(*) DESC
+        LIMIT 5
+    ) AS top_fraud_indicators
+FROM (
+    SELECT 
+        COUNT(*) as total_transactions,
+        COUNTIF(risk_level = 'HIGH') as high_risk_count,
+        COUNTIF(risk_level = 'MEDIUM') as medium_risk_count,
+        COUNTIF(risk_level = 'LOW') as low_risk_count,
+        AVG(risk_score) as avg_risk_score,
+        AVG(processing_time_ms) as avg_processing_time,
+        ARRAY_CONCAT_AGG(
+            IF(risk_level IN ('HIGH', 'MEDIUM'), fraud_indicators, [])
+        ) as flagged_indicators
+    FROM `{table}`
+    WHERE analyzed_at >= TIMESTAMP(@today)
+    AND analyzed_at < TIMESTAMP_ADD(TIMESTAMP(@today), INTERVAL 1 DAY)
+)
+"""
+
+# Daily rollup materialized view over the analysis table. BigQuery keeps it
+# incrementally up to date, so the summary's aggregates become a lookup of
+# one pre-aggregated row per day instead of a scan of the day's analyses.
+DAILY_ROLLUP_VIEW_DDL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS `{view}`
+PARTITION BY day
+AS
+SELECT
+    DATE(analyzed_at) as day,
+    COUNT(*) as total_transactions,
+    COUNTIF(risk_level = 'HIGH') as high_risk_count,
+    COUNTIF(risk_level = 'MEDIUM') as medium_risk_count,
+    COUNTIF(risk_level = 'LOW') as low_risk_count,
+    AVG(risk_score) as avg_risk_score,
+    AVG(processing_time_ms) as avg_processing_time
+FROM `{table}`
+GROUP BY day
+"""
+
+# Daily summary served from the rollup. Indicators cannot be pre-aggregated in
+# an incremental materialized view, so they are ranked in the same job from
+# the day's HIGH/MEDIUM rows only (clustered on risk_level).
+DAILY_ROLLUP_SUMMARY_SQL = """
+SELECT
+    rollup.total_transactions,
+    rollup.high_risk_count,
+    rollup.medium_risk_count,
+    rollup.low_risk_count,
+    rollup.avg_risk_score,
+    rollup.avg_processing_time,
+    ARRAY(
+        SELECT fraud_indicator
+        FROM `{table}`, UNNEST(fraud_indicators) AS fraud_indicator
+        WHERE analyzed_at >= TIMESTAMP(@today)
+        AND analyzed_at < TIMESTAMP_ADD(TIMESTAMP(@today), INTERVAL 1 DAY)
+        AND risk_level IN ('HIGH', 'MEDIUM')
+        GROUP BY fraud_indicator
+        ORDER BY COUNT(*) DESC
+        LIMIT 5
+    ) AS top_fraud_indicators
+FROM `{view}` AS rollup
+WHERE rollup.day = @today
+"""
+
+# Indicators reported when BigQuery has none for the day
+DEFAULT_TOP_FRAUD_INDICATORS = [
+    "Unusual transaction amount",
+    "Geographic anomaly",
+    "Suspicious timing pattern"
+]
+
+# Fields copied from analysis messages as-is; optional ones only when present
+ANALYSIS_MESSAGE_FIELDS = ("analysis_id", "transaction_id", "risk_score", "risk_level", "analysis_method")
+ANALYSIS_OPTIONAL_FIELDS = ("fraud_indicators", "recommendations", "analysis_summary",
+                            "confidence_score", "processing_time_ms")
+
+# Static Looker Studio dashboard layout, shared by every generated config
+LOOKER_DASHBOARD_CONFIG = {
+    "title": "Fraud Detection Analytics Dashboard",
+    "refresh_interval": "1 hour",
+    "charts": [
+        {
+            "type": "scorecard",
+            "title": "Daily Transactions",
+            "metric": "total_transactions"
+        },
+        {
+            "type": "line_chart",
+            "title": "Fraud Rate Trend",
+            "x_axis": "date",
+            "y_axis": "fraud_rate"
+        },
+        {
+            "type": "pie_chart",
+            "title": "Risk Level Distribution",
+            "dimension": "risk_level"
+        },
+        {
+            "type": "bar_chart",
+            "title": "Top Fraud Indicators",
+            "dimension": "fraud_indicators"
+        }
+    ]
+}
+
+# Report builders: (metrics, insights, recommendations) per report type
+ReportParts = Tuple[Dict[str, Any], List[str], List[str]]
+
+def _build_daily_summary_report(report_data: Dict[str, Any]) -> ReportParts:
+    """Build the stored parts of a daily summary report."""
+    get = report_data.get
+    metrics = {
+        "total_transactions": get('total_transactions', 0),
+        "high_risk_count": get('high_risk_count', 0),
+        "medium_risk_count": get('medium_risk_count', 0),
+        "low_risk_count": get('low_risk_count', 0),
+        "avg_risk_score": get('avg_risk_score', 0.0),
+        "avg_processing_time": get('avg_processing_time', 0.0),
+        "fraud_detection_rate": get('fraud_detection_rate', 0.0),
+        "false_positive_rate": get('false_positive_rate', 0.0)
+    }
+    return (metrics, get('top_fraud_indicators', []),
+            ["Monitor high-risk transactions", "Review detection thresholds"])
+
+def _build_weekly_trends_report(report_data: Dict[str, Any]) -> ReportParts:
+    """Build the stored parts of a weekly trends report."""
+    get = report_data.get
+    metrics = {
+        "trend_analysis": get('trend_analysis', {}),
+    }
+    return metrics, get('key_insights', []), get('recommendations', [])
+
+def _build_real_time_dashboard_report(report_data: Dict[str, Any]) -> ReportParts:
+    """Build the stored parts of a real-time dashboard report."""
+    get = report_data.get
+    metrics = {
+        "live_metrics": get('live_metrics', {}),
+        "performance_indicators": get('performance_indicators', {})
+    }
+    return metrics, ["Real-time monitoring active"], ["Continue monitoring"]
+
+_REPORT_BUILDERS = {
+    "daily_summary": _build_daily_summary_report,
+    "weekly_trends": _build_weekly_trends_report,
+    "real_time_dashboard": _build_real_time_dashboard_report,
+}
+
+_now_iso_cache = [0.0, ""]
+
+def _now_iso(max_age: float = 0.5) -> str:
+    """
+    Return the current local time as an ISO string, reformatted at most every
+    max_age seconds. For log, status and message metadata on hot paths where
+    sub-second precision does not matter; persisted columns use the exact
+    UTC time instead.
+    """
+    now = time.time()
+    if now - _now_iso_cache[0] > max_age:
+        _now_iso_cache[1] = datetime.fromtimestamp(now).isoformat()
+        _now_iso_cache[0] = now
+    return _now_iso_cache[1]
+
+def _to_timestamp_micros(value: Any) -> int:
+    """Convert an ISO string, datetime or epoch seconds to epoch microseconds."""
+    if isinstance(value, (int, float)):
+        return int(value * 1_000_000)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1_000_000)
+
+def _fetch_first_row(query_job: bigquery.QueryJob) -> Optional[Dict[str, Any]]:
+    """Wait for a query job and return its first row as a dict (blocking).
+    
+    Results are fetched as an Arrow table when pyarrow is installed, using the
+    BigQuery Storage read API (google-cloud-bigquery-storage) when available,
+    so rows are transferred columnar instead of being boxed one by one.
+    """
+    row_iterator = query_job.result()
+    if PYARROW_AVAILABLE:
+        table = row_iterator.to_arrow(create_bqstorage_client=bigquery_storage_v1 is not None)
+        if table.num_rows == 0:
+            return None
+        return {name: table.column(name)[0].as_py() for name in table.column_names}
+    for row in row_iterator:
+        return dict(row.items())
+    return None
+
+class StorageWriteStreams:
+    """
+    Appends rows through the BigQuery Storage Write API.
+    
+    Keeps one AppendRowsStream per table on its _default stream, with a proto
+    descriptor built once from the table schema. Rows are sent over a single
+    long-lived gRPC stream instead of one HTTPS request per insert.
+    """
+    
+    _PROTO_TYPES = {
+        "STRING": "TYPE_STRING",
+        "JSON": "TYPE_STRING",
+        "FLOAT": "TYPE_DOUBLE",
+        "FLOAT64": "TYPE_DOUBLE",
+        "INTEGER": "TYPE_INT64",
+        "INT64": "TYPE_INT64",
+        "BOOLEAN": "TYPE_BOOL",
+        "BOOL": "TYPE_BOOL",
+        "TIMESTAMP": "TYPE_INT64",
+    }
+    
+    def __init__(self, bq_client: bigquery.Client):
+        self._bq_client = bq_client
+        self._write_client = bigquery_storage_v1.BigQueryWriteClient()
+        self._streams: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def _build_message_class(self, message_name: str, schema: List[bigquery.SchemaField]):
+        """Build a proto2 message class and descriptor matching a table schema."""
+        field_proto = descriptor_pb2.FieldDescriptorProto
+        file_proto = descriptor_pb2.FileDescriptorProto(name=f"{message_name}.proto", syntax="proto2")
+        message_proto = file_proto.message_type.add(name=message_name)
+        for number, field in enumerate(schema, start=1):
+            if field.mode == "REPEATED":
+                label = field_proto.LABEL_REPEATED
+            elif field.mode == "REQUIRED":
+                label = field_proto.LABEL_REQUIRED
+            else:
+                label = field_proto.LABEL_OPTIONAL
+            message_proto.field.add(
+                name=field.name,
+                number=number,
+                type=getattr(field_proto, self._PROTO_TYPES[field.field_type]),
+                label=label,
+            )
+        
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(file_proto)
+        descriptor = pool.FindMessageTypeByName(message_name)
+        if hasattr(message_factory, "GetMessageClass"):
+            message_class = message_factory.GetMessageClass(descriptor)
+        else:
+            message_class = message_factory.MessageFactory(pool).GetPrototype(descriptor)
+        return message_class, message_proto
+    
+    def _get_stream(self, table_id: str, schema: Optional[Sequence[bigquery.SchemaField]] = None):
+        """
+        Return (message_class, field_types, stream) for a table, opening it on first use.
+        
+        The table is only fetched from BigQuery when no known schema is given.
+        """
+        with self._lock:
+            entry = self._streams.get(table_id)
+            if entry is not None:
+                return entry
+            
+            if schema is None:
+                table = self._bq_client.get_table(table_id)
+                project, dataset_id, table_name = table.project, table.dataset_id, table.table_id
+                schema = table.schema
+            else:
+                project, dataset_id, table_name = table_id.split(".")
+            message_class, message_proto = self._build_message_class(table_name, schema)
+            field_types = {field.name: field.field_type for field in schema}
+            
+            request_template = storage_types.AppendRowsRequest()
+            table_path = self._write_client.table_path(project, dataset_id, table_name)
+            request_template.write_stream = f"{table_path}/streams/_default"
+            proto_schema = storage_types.ProtoSchema()
+            proto_schema.proto_descriptor = message_proto
+            proto_data = storage_types.AppendRowsRequest.ProtoData()
+            proto_data.writer_schema = proto_schema
+            request_template.proto_rows = proto_data
+            
+            stream = storage_writer.AppendRowsStream(self._write_client, request_template)
+            entry = (message_class, field_types, stream)
+            self._streams[table_id] = entry
+            return entry
+    
+    def _drop_stream(self, table_id: str) -> None:
+        """Close and forget a table's stream so the next append reopens it."""
+        with self._lock:
+            entry = self._streams.pop(table_id, None)
+        if entry is not None:
+            try:
+                entry[2].close()
+            except Exception:
+                pass
+    
+    def close(self) -> None:
+        """Close every open append stream."""
+        with self._lock:
+            table_ids = list(self._streams)
+        for table_id in table_ids:
+            self._drop_stream(table_id)
+    
+    @staticmethod
+    def _to_message(message_class, field_types: Dict[str, str], row: Dict[str, Any]):
+        """Convert a JSON-style row into a proto message for its table."""
+        message = message_class()
+        for name, value in row.items():
+            if value is None:
+                continue
+            field_type = field_types.get(name)
+            if field_type is None:
+                raise ValueError(f"Field {name} is not in the table schema")
+            if field_type == "TIMESTAMP":
+                value = _to_timestamp_micros(value)
+            elif field_type == "JSON" and not isinstance(value, str):
+                value = _dumps(value)
+            
+            if isinstance(value, list):
+                getattr(message, name).extend(value)
+            else:
+                setattr(message, name, value)
+        return message
+    
+    def append(self, table_id: str, rows: List[Dict[str, Any]],
+               schema: Optional[Sequence[bigquery.SchemaField]] = None) -> List[Dict[str, Any]]:
+        """
+        Append rows to a table (blocking).
+        
+        Returns:
+            Row errors in the same shape as insert_rows_json
+        """
+        message_class, field_types, stream = self._get_stream(table_id, schema)
+        serialized_rows = [
+            self._to_message(message_class, field_types, row).SerializeToString()
+            for row in rows
+        ]
+        
+        request = storage_types.AppendRowsRequest()
+        proto_data = storage_types.AppendRowsRequest.ProtoData()
+        proto_data.rows = storage_types.ProtoRows(serialized_rows=serialized_rows)
+        request.proto_rows = proto_data
+        
+        try:
+            response = stream.send(request).result()
+        except Exception:
+            self._drop_stream(table_id)
+            raise
+        
+        return [{"index": error.index, "errors": [error.message]} for error in response.row_errors]
+
 class ReportingAgent(BaseAgent):
     """
     Reporting agent for fraud detection analytics and data warehousing.
@@ -68,32 +735,52 @@ class ReportingAgent(BaseAgent):
             "monitoring-results"
         ]
         
+        # Deployment environment, read once (unset means production behaviour)
+        self._environment = os.getenv("ENVIRONMENT")
+        self._is_development = self._environment == "development"
+        
         # BigQuery configuration
         self._bq_client = bigquery.Client(project=project_id)
         self._dataset_ref = self._bq_client.dataset(self._dataset_id)
         
-        # Pub/Sub configuration
-        self._subscriber = pubsub_v1.SubscriberClient()
-        self._publisher = pubsub_v1.PublisherClient()
+        # Pub/Sub configuration (clients shared process-wide)
+        self._publisher, self._subscriber = _acquire_pubsub_clients()
+        self._clients_released = False
         
-        # Build subscription paths
-        self._subscription_paths = []
-        for subscription in self._reporting_subscriptions:
-            path = self._subscriber.subscription_path(project_id, subscription)
-            self._subscription_paths.append(path)
+        # Build (subscription name, subscription path) pairs
+        self._subscription_paths: List[Tuple[str, str]] = [
+            (subscription, self._subscriber.subscription_path(project_id, subscription))
+            for subscription in self._reporting_subscriptions
+        ]
         
         # Reporting topic for downstream consumers
         self._reports_topic_path = self._publisher.topic_path(project_id, "fraud-reports")
         
+        # Dead-letter topic for rows BigQuery rejected
+        self._dlq_topic_path = self._publisher.topic_path(project_id, "fraud-reports-dlq")
+        
         # Default reporting configuration
         self._reporting_config = reporting_config or {
             "batch_size": 100,
             "batch_timeout": 30,  # seconds
+            "streaming": {
+                "max_rows": DEFAULT_STREAMING_MAX_ROWS,
+                "max_bytes": DEFAULT_STREAMING_MAX_BYTES,
+                "max_concurrent_inserts": DEFAULT_MAX_CONCURRENT_INSERTS,
+                "batch_max_rows": DEFAULT_BATCH_MAX_ROWS,
+                "batch_max_latency_ms": DEFAULT_BATCH_MAX_LATENCY_MS,
+                "load_job_tables": list(DEFAULT_LOAD_JOB_TABLES),
+                "load_batch_rows": DEFAULT_LOAD_BATCH_ROWS,
+                "load_interval_seconds": DEFAULT_LOAD_INTERVAL_SECONDS,
+                "pending_high_water_bytes": DEFAULT_PENDING_HIGH_WATER_BYTES,
+                "use_storage_write_api": True
+            },
             "tables": {
                 "transactions": "fraud_transactions",
                 "analysis_results": "fraud_analysis",
                 "alerts": "fraud_alerts",
-                "reports": "fraud_reports"
+                "reports": "fraud_reports",
+                "daily_rollup": "fraud_events_daily"
             },
             "reports": {
                 "daily_summary": True,
@@ -107,8 +794,98 @@ class ReportingAgent(BaseAgent):
             }
         }
         
+        # Fully qualified table IDs, resolved once per agent
+        self._table_ids = {
+            table_type: f"{project_id}.{self._dataset_id}.{table_name}"
+            for table_type, table_name in self._reporting_config["tables"].items()
+        }
+        
+        # Daily-summary SQL rendered once; only the @today parameter varies per call
+        self._daily_summary_sql = DAILY_SUMMARY_SQL.format(table=self._table_ids['analysis_results'])
+        self._daily_rollup_summary_sql = DAILY_ROLLUP_SUMMARY_SQL.format(
+            table=self._table_ids['analysis_results'],
+            view=self._table_ids.get('daily_rollup', ''))
+        
+        # Message handler per subscription; both analysis feeds share one handler
+        self._message_handlers = {
+            "analysis-results": self._process_analysis_message,
+            "hybrid-analysis-results": self._process_analysis_message,
+            "fraud-alerts": self._process_alert_message,
+            "monitoring-results": self._process_monitoring_message,
+        }
+        
+        # Table fed by each subscription, for sizing its flow control
+        self._subscription_tables = {
+            "analysis-results": "analysis_results",
+            "hybrid-analysis-results": "analysis_results",
+            "fraud-alerts": "alerts",
+            "monitoring-results": "transactions",
+        }
+        
+        # Bounds in-flight BigQuery inserts, which run on a dedicated thread pool
+        # so they never queue behind other work on the default executor
+        max_concurrent_inserts = self._reporting_config.get("streaming", {}).get(
+            "max_concurrent_inserts", DEFAULT_MAX_CONCURRENT_INSERTS)
+        self._insert_semaphore = asyncio.Semaphore(max_concurrent_inserts)
+        self._bq_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrent_inserts, thread_name_prefix="bq-insert")
+        
+        # Recovery-file writes run on a single worker thread, which serializes
+        # appends to the per-table file handles it owns
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="recovery-io")
+        self._recovery_files: Dict[str, Any] = {}
+        
+        # Micro-batching of per-message rows, keyed by table type
+        streaming_config = self._reporting_config.get("streaming", {})
+        self._batch_max_rows = streaming_config.get("batch_max_rows", DEFAULT_BATCH_MAX_ROWS)
+        self._batch_max_latency_ms = streaming_config.get("batch_max_latency_ms", DEFAULT_BATCH_MAX_LATENCY_MS)
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._pending_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_tasks: set = set()
+        
+        # Load-job buffering for bulk tables (oldest pending row time per table)
+        self._load_job_tables = set(streaming_config.get("load_job_tables", DEFAULT_LOAD_JOB_TABLES))
+        self._load_batch_rows = streaming_config.get("load_batch_rows", DEFAULT_LOAD_BATCH_ROWS)
+        self._load_interval = streaming_config.get("load_interval_seconds", DEFAULT_LOAD_INTERVAL_SECONDS)
+        self._load_pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._load_started: Dict[str, float] = {}
+        
+        # Pub/Sub messages behind the buffered rows, acked only once their rows
+        # have been written (or dead-lettered), so a crash leads to redelivery
+        self._pending_messages: Dict[str, List[Any]] = defaultdict(list)
+        self._load_pending_messages: Dict[str, List[Any]] = defaultdict(list)
+        
+        # Approximate serialized bytes buffered per table, for back-pressure
+        self._pending_bytes: Dict[str, int] = defaultdict(int)
+        self._pending_high_water = streaming_config.get(
+            "pending_high_water_bytes", DEFAULT_PENDING_HIGH_WATER_BYTES)
+        
+        # Storage Write API for streaming inserts; insert_rows_json is the
+        # fallback in development or when google-cloud-bigquery-storage is missing
+        self._storage_writer: Optional[StorageWriteStreams] = None
+        use_storage_write = self._reporting_config.get("streaming", {}).get("use_storage_write_api", True)
+        use_storage_write = use_storage_write and os.getenv("BQ_USE_STORAGE_WRITE_API", "true").lower() == "true"
+        if STORAGE_WRITE_AVAILABLE and use_storage_write and not self._is_development:
+            try:
+                self._storage_writer = StorageWriteStreams(self._bq_client)
+            except Exception as e:
+                logger.warning(f"Storage Write API unavailable, using streaming inserts: {e}")
+        
+        # Subscription readiness for the current workflow run
+        self._subscriptions_ready: Optional[asyncio.Event] = None
+        self._ready_count = 0
+        
+        # Set by stop() to end the subscriptions and drain pending rows
+        self._stop = asyncio.Event()
+        self._subscription_tasks: List[asyncio.Task] = []
+        
+        # Set once the daily rollup materialized view is known to exist
+        self._daily_rollup_ready = False
+        
         # Initialize BigQuery tables (skip in development/testing)
-        if os.getenv("ENVIRONMENT") != "development":
+        if not self._is_development:
             self._initialize_bigquery_tables()
         else:
             logger.info("Skipping BigQuery initialization in development mode")
@@ -136,11 +913,20 @@ class ReportingAgent(BaseAgent):
                 self._bq_client.create_dataset(dataset, timeout=30)
                 logger.info(f"Created dataset {self._dataset_id}")
             
-            # Define table schemas
-            self._create_transactions_table()
-            self._create_analysis_results_table()
-            self._create_alerts_table()
-            self._create_reports_table()
+            # Create the independent tables concurrently; each is a get/create round-trip
+            table_creators = [
+                self._create_transactions_table,
+                self._create_analysis_results_table,
+                self._create_alerts_table,
+                self._create_reports_table,
+            ]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(table_creators)) as executor:
+                futures = [executor.submit(create) for create in table_creators]
+                for future in futures:
+                    future.result()
+            
+            # The rollup view reads the analysis table, so create it afterwards
+            self._create_daily_rollup_view()
             
         except Exception as e:
             logger.error(f"Error initializing BigQuery tables: {str(e)}")
@@ -148,90 +934,114 @@ class ReportingAgent(BaseAgent):
     
     def _create_transactions_table(self):
         """Create transactions table for raw transaction data."""
-        table_id = f"{self._project_id}.{self._dataset_id}.{self._reporting_config['tables']['transactions']}"
+        table_id = self._table_ids['transactions']
         
-        schema = [
-            bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("timestamp", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("amount", "FLOAT64", mode="REQUIRED"),
-            bigquery.SchemaField("merchant", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("location", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("card_type", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("features", "JSON", mode="NULLABLE"),
-            bigquery.SchemaField("processed_at", "TIMESTAMP", mode="REQUIRED"),
-        ]
+        schema = list(TRANSACTIONS_SCHEMA)
         
-        self._create_table_if_not_exists(table_id, schema, "Raw transaction data")
+        self._create_table_if_not_exists(table_id, schema, "Raw transaction data",
+                                         partition_field="timestamp",
+                                         clustering_fields=["transaction_id"])
     
     def _create_analysis_results_table(self):
         """Create analysis results table for fraud analysis outcomes."""
-        table_id = f"{self._project_id}.{self._dataset_id}.{self._reporting_config['tables']['analysis_results']}"
+        table_id = self._table_ids['analysis_results']
         
-        schema = [
-            bigquery.SchemaField("analysis_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("analysis_method", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("risk_score", "FLOAT64", mode="REQUIRED"),
-            bigquery.SchemaField("risk_level", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("fraud_indicators", "STRING", mode="REPEATED"),
-            bigquery.SchemaField("recommendations", "STRING", mode="REPEATED"),
-            bigquery.SchemaField("analysis_summary", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("confidence_score", "FLOAT64", mode="NULLABLE"),
-            bigquery.SchemaField("processing_time_ms", "INTEGER", mode="NULLABLE"),
-            bigquery.SchemaField("analyzed_at", "TIMESTAMP", mode="REQUIRED"),
-        ]
+        schema = list(ANALYSIS_RESULTS_SCHEMA)
         
-        self._create_table_if_not_exists(table_id, schema, "Fraud analysis results")
+        # Daily partitions on analyzed_at let date-bounded summaries prune whole days;
+        # clustering on risk_level and transaction_id serves the risk breakdowns and lookups
+        self._create_table_if_not_exists(table_id, schema, "Fraud analysis results",
+                                         partition_field="analyzed_at",
+                                         clustering_fields=["risk_level", "transaction_id"])
     
     def _create_alerts_table(self):
         """Create alerts table for fraud alerts and notifications."""
-        table_id = f"{self._project_id}.{self._dataset_id}.{self._reporting_config['tables']['alerts']}"
+        table_id = self._table_ids['alerts']
         
-        schema = [
-            bigquery.SchemaField("alert_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("priority", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("urgency", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("alert_type", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("notification_channels", "STRING", mode="REPEATED"),
-            bigquery.SchemaField("alert_status", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("acknowledged_by", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("resolution_notes", "STRING", mode="NULLABLE"),
-            bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("resolved_at", "TIMESTAMP", mode="NULLABLE"),
-        ]
+        schema = list(ALERTS_SCHEMA)
         
-        self._create_table_if_not_exists(table_id, schema, "Fraud alerts and notifications")
+        self._create_table_if_not_exists(table_id, schema, "Fraud alerts and notifications",
+                                         partition_field="created_at",
+                                         clustering_fields=["priority", "transaction_id"])
     
     def _create_reports_table(self):
         """Create reports table for generated reports and insights."""
-        table_id = f"{self._project_id}.{self._dataset_id}.{self._reporting_config['tables']['reports']}"
+        table_id = self._table_ids['reports']
         
-        schema = [
-            bigquery.SchemaField("report_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("report_type", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("report_period", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("metrics", "JSON", mode="REQUIRED"),
-            bigquery.SchemaField("insights", "STRING", mode="REPEATED"),
-            bigquery.SchemaField("recommendations", "STRING", mode="REPEATED"),
-            bigquery.SchemaField("data_quality_score", "FLOAT64", mode="NULLABLE"),
-            bigquery.SchemaField("generated_at", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("report_url", "STRING", mode="NULLABLE"),
-        ]
+        schema = list(REPORTS_SCHEMA)
+        
+        self._create_table_if_not_exists(table_id, schema, "Generated reports and insights",
+                                         partition_field="generated_at",
+                                         clustering_fields=["report_type"])
+    
+    def _create_daily_rollup_view(self):
+        """Create the daily rollup materialized view over the analysis results table."""
+        view_id = self._table_ids.get('daily_rollup')
+        if view_id is None:
+            return
         
-        self._create_table_if_not_exists(table_id, schema, "Generated reports and insights")
+        try:
+            ddl = DAILY_ROLLUP_VIEW_DDL.format(view=view_id, table=self._table_ids['analysis_results'])
+            self._bq_client.query(ddl).result()
+            self._daily_rollup_ready = True
+            logger.info(f"Daily rollup view {view_id} is ready")
+        except Exception as e:
+            # Summaries fall back to querying the analysis table directly
+            logger.warning(f"Could not create daily rollup view {view_id}: {str(e)}")
     
-    def _create_table_if_not_exists(self, table_id: str, schema: List[bigquery.SchemaField], description: str):
-        """Create BigQuery table if it doesn't exist."""
+    def _create_table_if_not_exists(self, table_id: str, schema: List[bigquery.SchemaField], description: str,
+                                    partition_field: Optional[str] = None,
+                                    clustering_fields: Optional[List[str]] = None):
+        """
+        Create BigQuery table if it doesn't exist.
+        
+        New tables are partitioned by day on partition_field and clustered on
+        clustering_fields so date-bounded queries only read the matching slice.
+        Existing tables gain any NULLABLE columns added to the schema since
+        they were created.
+        """
         try:
-            self._bq_client.get_table(table_id)
+            table = self._bq_client.get_table(table_id)
             logger.info(f"Table {table_id} already exists")
+            
+            existing_fields = {field.name for field in table.schema}
+            missing_fields = [
+                field for field in schema
+                if field.name not in existing_fields and field.mode == "NULLABLE"
+            ]
+            if missing_fields:
+                table.schema = list(table.schema) + missing_fields
+                self._bq_client.update_table(table, ["schema"])
+                logger.info(f"Added {len(missing_fields)} columns to table {table_id}")
         except NotFound:
             table = bigquery.Table(table_id, schema=schema)
             table.description = description
+            if partition_field:
+                table.time_partitioning = bigquery.TimePartitioning(
+                    type_=bigquery.TimePartitioningType.DAY,
+                    field=partition_field
+                )
+            if clustering_fields:
+                table.clustering_fields = clustering_fields
             table = self._bq_client.create_table(table)
             logger.info(f"Created table {table.table_id}")
 
+    def _insert_rows(self, table_type: str, table_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rows (blocking), preferring the Storage Write API over insert_rows_json."""
+        if self._storage_writer is not None:
+            try:
+                return self._storage_writer.append(table_id, rows, SCHEMAS_BY_TABLE_TYPE.get(table_type))
+            except Exception as e:
+                logger.warning(f"[{self.name}] Storage Write API append failed, using insert_rows_json: {e}")
+        # Rows without an ID fall back to a content hash, which is stable across retries
+        row_id_field = ROW_ID_FIELDS.get(table_type)
+        row_ids = [
+            (row.get(row_id_field) if row_id_field else None)
+            or hashlib.blake2b(_dumps_bytes(row), digest_size=16).hexdigest()
+            for row in rows
+        ]
+        return self._bq_client.insert_rows_json(table_id, rows, row_ids=row_ids)
+
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
         Main reporting workflow following ADK best practices.
@@ -262,7 +1072,7 @@ class ReportingAgent(BaseAgent):
                 author=self.name,
                 actions=EventActions(state_delta={
                     "reporting_status": "collecting_data",
-                    "collection_start_time": datetime.now().isoformat()
+                    "collection_start_time": _now_iso()
                 }),
                 content=types.Content(
                     role='assistant',
@@ -273,49 +1083,64 @@ class ReportingAgent(BaseAgent):
             # Process data in background using real Pub/Sub subscriptions
             data_processing_tasks = []
             
-            # Start real-time Pub/Sub subscription tasks for each topic
-            for subscription_name in self._reporting_subscriptions:
-                subscription_path = self._subscriber.subscription_path(
-                    self._project_id, subscription_name)
-                
-                # Create subscription task for this topic
-                subscription_task = asyncio.create_task(
-                    self._subscribe_to_pubsub(subscription_path, subscription_name)
-                )
-                data_processing_tasks.append(subscription_task)
+            # In development BigQuery is skipped, so background collection would only
+            # log and fail; go straight to the (mock) daily summary instead
+            if not self._is_development:
+                # Background flush of micro-batched rows from the subscriptions
+                if self._flush_task is None or self._flush_task.done():
+                    self._flush_task = asyncio.create_task(self._flush_loop())
                 
-                yield Event(
-                    author=self.name,
-                    actions=EventActions(state_delta={
-                        f"subscription_{subscription_name}": "started",
-                    }),
-                    content=types.Content(
-                        role='assistant',
-                        parts=[types.Part(text=f"📡 Started real-time subscription to {subscription_name}")]
+                # Start real-time Pub/Sub subscription tasks for each topic
+                self._subscriptions_ready = asyncio.Event()
+                self._ready_count = 0
+                if not self._subscription_paths:
+                    self._subscriptions_ready.set()
+            
+                started_subscriptions = {}
+                for subscription_name, subscription_path in self._subscription_paths:
+                    # Create subscription task for this topic
+                    subscription_task = asyncio.create_task(
+                        self._subscribe_to_pubsub(subscription_path, subscription_name)
+                    )
+                    data_processing_tasks.append(subscription_task)
+                    self._subscription_tasks.append(subscription_task)
+                    started_subscriptions[f"subscription_{subscription_name}"] = "started"
+            
+                # Report all started subscriptions in a single event
+                if started_subscriptions:
+                    yield Event(
+                        author=self.name,
+                        actions=EventActions(state_delta=started_subscriptions),
+                        content=types.Content(
+                            role='assistant',
+                            parts=[types.Part(text=f"📡 Started real-time subscriptions to {', '.join(self._reporting_subscriptions)}")]
+                        )
                     )
-                )
             
-            # For compatibility with session-based reporting, also collect from session state if available
-            if hasattr(ctx, 'session') and hasattr(ctx.session, 'state'):
-                # Collect historical data from session state if available
-                analysis_task = asyncio.create_task(
-                    self._collect_analysis_results(ctx.session.state)
-                )
-                data_processing_tasks.append(analysis_task)
+                # For compatibility with session-based reporting, also collect from session state if available
+                if hasattr(ctx, 'session') and hasattr(ctx.session, 'state'):
+                    # Collect historical data from session state if available
+                    analysis_task = asyncio.create_task(
+                        self._collect_analysis_results(ctx.session.state)
+                    )
+                    data_processing_tasks.append(analysis_task)
                 
-                alerts_task = asyncio.create_task(
-                    self._collect_alert_data(ctx.session.state)
-                )
-                data_processing_tasks.append(alerts_task)
+                    alerts_task = asyncio.create_task(
+                        self._collect_alert_data(ctx.session.state)
+                    )
+                    data_processing_tasks.append(alerts_task)
             
-            # Generate reports based on available data
-            reports_task = asyncio.create_task(
-                self._generate_reports(ctx.session.state if hasattr(ctx, 'session') else {})
-            )
-            data_processing_tasks.append(reports_task)
+                # Generate reports based on available data
+                reports_task = asyncio.create_task(
+                    self._generate_reports(ctx.session.state if hasattr(ctx, 'session') else {})
+                )
+                data_processing_tasks.append(reports_task)
             
-            # Wait for initial data processing
-            await asyncio.sleep(2)  # Allow time for data collection
+                # Wait until every subscription is streaming (or failed), bounded by a timeout
+                try:
+                    await asyncio.wait_for(self._subscriptions_ready.wait(), timeout=SUBSCRIPTION_READY_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"[{self.name}] Subscriptions not ready after {SUBSCRIPTION_READY_TIMEOUT}s, continuing")
             
             # Step 3: Generate analytics reports
             yield Event(
@@ -330,8 +1155,8 @@ class ReportingAgent(BaseAgent):
                 )
             )
             
-            # Generate daily summary
-            daily_summary = await self._generate_daily_summary()
+            # Generate daily summary and publish it for downstream consumption
+            daily_summary = await self._generate_daily_summary(publish=True)
             
             # Update session state with report data
             yield Event(
@@ -348,10 +1173,7 @@ class ReportingAgent(BaseAgent):
                 )
             )
             
-            # Step 4: Publish reports for downstream consumption
-            await self._publish_reports(daily_summary)
-            
-            # Step 5: Finalize reporting workflow
+            # Step 4: Finalize reporting workflow
             final_stats = {
                 "total_records_processed": self._total_records_processed,
                 "reports_generated": self._total_reports_generated,
@@ -439,14 +1261,21 @@ class ReportingAgent(BaseAgent):
                 await self._update_real_time_dashboard()
                 self._total_reports_generated += 1
                 
-            self._last_report_timestamp = datetime.now().isoformat()
+            self._last_report_timestamp = _now_iso()
             
         except Exception as e:
             logger.error(f"[{self.name}] Error generating reports: {str(e)}")
 
-    async def _generate_daily_summary(self) -> Dict[str, Any]:
-        """Generate daily fraud detection summary report using real BigQuery queries."""
+    async def _generate_daily_summary(self, publish: bool = False) -> Dict[str, Any]:
+        """Generate daily fraud detection summary report using real BigQuery queries.
+
+        With ``publish`` the stored report is also published to Pub/Sub,
+        reusing the bytes serialized for storage.
+        """
         try:
+            # Bind hot attribute lookups once
+            name = self.name
+            query = self._bq_client.query
             today = datetime.now().strftime("%Y-%m-%d")
             report_id = f"DAILY_SUMMARY_{today.replace('-', '')}"
             
@@ -455,47 +1284,52 @@ class ReportingAgent(BaseAgent):
                 "report_id": report_id,
                 "report_type": "daily_summary",
                 "date": today,
-                "generated_at": datetime.now().isoformat()
+                "generated_at": datetime.now(timezone.utc).isoformat()
             }
             
-            # 1. Query for transaction counts and risk levels
-            transaction_query = f"""
-            SELECT 
-                COUNT(*) as total_transactions,
-                SUM(CASE WHEN risk_level = 'HIGH' THEN 1 ELSE 0 END) as high_risk_count,
-                SUM(CASE WHEN risk_level = 'MEDIUM' THEN 1 ELSE 0 END) as medium_risk_count,
-                SUM(CASE WHEN risk_level = 'LOW' THEN 1 ELSE 0 END) as low_risk_count,
-                AVG(risk_score) as avg_risk_score,
-                AVG(processing_time_ms) as avg_processing_time
-            FROM `{self._project_id}.{self._dataset_id}.{self._reporting_config['tables']['analysis_results']}`
-            WHERE DATE(analyzed_at) = '{today}'
-            """
-            
-            # Execute transaction query
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[bigquery.ScalarQueryParameter("today", "DATE", today)],
+                use_query_cache=True
+            )
+            
+            # 1. Query for transaction counts, risk levels and top fraud indicators
+            # Execute summary query, served from the daily rollup when it exists
             try:
-                # In production, execute the real query
-                query_job = self._bq_client.query(transaction_query)
-                results = await asyncio.to_thread(lambda: list(query_job.result()))
+                row = None
+                if self._daily_rollup_ready:
+                    try:
+                        query_job = query(self._daily_rollup_summary_sql, job_config=job_config)
+                        row = await asyncio.to_thread(_fetch_first_row, query_job)
+                    except Exception as rollup_error:
+                        logger.warning(f"[{name}] Daily rollup query failed, using live query: {str(rollup_error)}")
+                
+                if not row:
+                    # In production, execute the real query
+                    query_job = query(self._daily_summary_sql, job_config=job_config)
+                    row = await asyncio.to_thread(_fetch_first_row, query_job)
                 
-                if results and len(results) > 0:
-                    row = results[0]
+                if row:
                     # Extract results
+                    total_transactions = row.get("total_transactions") or 0
+                    high_risk_count = row.get("high_risk_count") or 0
+                    medium_risk_count = row.get("medium_risk_count") or 0
                     daily_summary.update({
-                        "total_transactions": row.total_transactions or 0,
-                        "high_risk_count": row.high_risk_count or 0,
-                        "medium_risk_count": row.medium_risk_count or 0,
-                        "low_risk_count": row.low_risk_count or 0,
-                        "avg_risk_score": row.avg_risk_score or 0.0,
-                        "avg_processing_time": row.avg_processing_time or 0.0
+                        "total_transactions": total_transactions,
+                        "high_risk_count": high_risk_count,
+                        "medium_risk_count": medium_risk_count,
+                        "low_risk_count": row.get("low_risk_count") or 0,
+                        "avg_risk_score": row.get("avg_risk_score") or 0.0,
+                        "avg_processing_time": row.get("avg_processing_time") or 0.0,
+                        "top_fraud_indicators": list(row.get("top_fraud_indicators") or []) or list(DEFAULT_TOP_FRAUD_INDICATORS)
                     })
                     
                     # Calculate fraud detection rate if we have data
-                    if row.total_transactions and row.total_transactions > 0:
-                        total_fraud_cases = row.high_risk_count + row.medium_risk_count
-                        daily_summary["fraud_detection_rate"] = total_fraud_cases / row.total_transactions
+                    if total_transactions > 0:
+                        total_fraud_cases = high_risk_count + medium_risk_count
+                        daily_summary["fraud_detection_rate"] = total_fraud_cases / total_transactions
                 else:
                     # No data for today, use fallback values
-                    logger.warning(f"[{self.name}] No transaction data found for date: {today}")
+                    logger.warning(f"[{name}] No transaction data found for date: {today}")
                     daily_summary.update({
                         "total_transactions": 0,
                         "high_risk_count": 0,
@@ -503,10 +1337,11 @@ class ReportingAgent(BaseAgent):
                         "low_risk_count": 0,
                         "avg_risk_score": 0.0,
                         "avg_processing_time": 0.0,
-                        "fraud_detection_rate": 0.0
+                        "fraud_detection_rate": 0.0,
+                        "top_fraud_indicators": list(DEFAULT_TOP_FRAUD_INDICATORS)
                     })
             except Exception as query_error:
-                logger.error(f"[{self.name}] Error running transaction query: {str(query_error)}")
+                logger.error(f"[{name}] Error running daily summary query: {str(query_error)}")
                 # If we fail to query BigQuery, use fallback mock data for demo purposes
                 daily_summary.update({
                     "total_transactions": 1250,
@@ -516,64 +1351,30 @@ class ReportingAgent(BaseAgent):
                     "avg_risk_score": 0.234,
                     "avg_processing_time": 125.7,
                     "fraud_detection_rate": 0.036,  # 3.6%
+                    "top_fraud_indicators": list(DEFAULT_TOP_FRAUD_INDICATORS)
                 })
             
-            # 2. Query for top fraud indicators
-            indicators_query = f"""
-            SELECT 
-                fraud_indicator,
-                COUNT(*) as indicator_count
-            FROM (
-                SELECT UNNEST(fraud_indicators) as fraud_indicator
-                FROM `{self._project_id}.{self._dataset_id}.{self._reporting_config['tables']['analysis_results']}`
-                WHERE DATE(analyzed_at) = '{today}'
-                AND risk_level IN ('HIGH', 'MEDIUM')
-            )
-            GROUP BY fraud_indicator
-            ORDER BY indicator_count DESC
-            LIMIT 5
-            """
-            
-            try:
-                # In production, execute the real query
-                query_job = self._bq_client.query(indicators_query)
-                results = await asyncio.to_thread(lambda: list(query_job.result()))
-                
-                top_indicators = [row.fraud_indicator for row in results] if results else [
-                    "Unusual transaction amount",
-                    "Geographic anomaly",
-                    "Suspicious timing pattern"
-                ]
-                
-                daily_summary["top_fraud_indicators"] = top_indicators
-            except Exception as query_error:
-                logger.error(f"[{self.name}] Error running fraud indicators query: {str(query_error)}")
-                # Fallback indicators
-                daily_summary["top_fraud_indicators"] = [
-                    "Unusual transaction amount",
-                    "Geographic anomaly", 
-                    "Suspicious timing pattern"
-                ]
-            
-            # 3. Calculate false positive rate (this would require feedback data in a real system)
+            # 2. Calculate false positive rate (this would require feedback data in a real system)
             # In a real system, you would join with a feedback table where analysts mark false positives
             # For demo purposes, we'll use a static estimate
             daily_summary["false_positive_rate"] = 0.012  # 1.2%
             
-            # 4. Store the report in BigQuery
-            await self._store_report(daily_summary)
+            # 3. Store the report in BigQuery
+            summary_bytes = await self._store_report(daily_summary)
+            if publish:
+                await self._publish_reports(daily_summary, summary_bytes)
             
-            logger.info(f"[{self.name}] Generated daily summary: {daily_summary['total_transactions']} transactions")
+            logger.info(f"[{name}] Generated daily summary: {daily_summary['total_transactions']} transactions")
             return daily_summary
             
         except Exception as e:
-            logger.error(f"[{self.name}] Error generating daily summary: {str(e)}")
+            logger.error(f"[{name}] Error generating daily summary: {str(e)}")
             # Return minimal information in case of error
             return {
                 "report_type": "daily_summary",
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "error": str(e),
-                "generated_at": datetime.now().isoformat()
+                "generated_at": datetime.now(timezone.utc).isoformat()
             }
 
     async def _generate_weekly_trends(self) -> Dict[str, Any]:
@@ -598,7 +1399,7 @@ class ReportingAgent(BaseAgent):
                     "Enhance international transaction validation",
                     "Update risk scoring models"
                 ],
-                "generated_at": datetime.now().isoformat()
+                "generated_at": datetime.now(timezone.utc).isoformat()
             }
             
             await self._store_report(weekly_trends)
@@ -614,7 +1415,7 @@ class ReportingAgent(BaseAgent):
         try:
             dashboard_metrics = {
                 "report_type": "real_time_dashboard",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "live_metrics": {
                     "transactions_per_minute": 45.2,
                     "current_risk_level": "MEDIUM",
@@ -634,107 +1435,360 @@ class ReportingAgent(BaseAgent):
         except Exception as e:
             logger.error(f"[{self.name}] Error updating dashboard: {str(e)}")
 
+    @staticmethod
+    def _iter_chunks(data: List[Dict[str, Any]], max_rows: int,
+                     max_bytes: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Split rows into chunks bounded by row count and serialized size.
+        
+        The caps are checked before a row is added, so a chunk never exceeds
+        either limit unless a single row is larger than max_bytes on its own.
+        """
+        chunk: List[Dict[str, Any]] = []
+        chunk_bytes = 0
+        for row in data:
+            row_bytes = len(_dumps_bytes(row))
+            if chunk and (len(chunk) >= max_rows or chunk_bytes + row_bytes > max_bytes):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            yield chunk
+
     async def _stream_to_bigquery(self, table_type: str, data: List[Dict[str, Any]]):
-        """Stream data to BigQuery tables."""
+        """Stream data to BigQuery tables in quota-sized chunks."""
         try:
-            table_name = self._reporting_config['tables'].get(table_type)
-            if not table_name:
-                logger.warning(f"[{self.name}] Unknown table type: {table_type}")
+            name = self.name
+            table_id = self._table_ids.get(table_type)
+            if table_id is None:
+                logger.warning(f"[{name}] Unknown table type: {table_type}")
                 return
             
-            table_id = f"{self._project_id}.{self._dataset_id}.{table_name}"
+            streaming_config = self._reporting_config.get("streaming", {})
+            max_rows = min(streaming_config.get("max_rows", DEFAULT_STREAMING_MAX_ROWS),
+                           STREAMING_MAX_ROWS_LIMIT)
+            max_bytes = streaming_config.get("max_bytes", DEFAULT_STREAMING_MAX_BYTES)
             
-            # Real production BigQuery insertion with retries
-            max_retries = 3
-            retry_count = 0
-            
-            while retry_count < max_retries:
-                try:
-                    # Stream data to BigQuery (without adding processed_at as it's not in schema)
-                    errors = self._bq_client.insert_rows_json(table_id, data)
-                    
-                    if not errors:
-                        logger.info(f"[{self.name}] Successfully streamed {len(data)} records to {table_name}")
-                        self._total_records_processed += len(data)
-                        break
-                    else:
-                        logger.error(f"[{self.name}] BigQuery insert errors: {errors}")
-                        retry_count += 1
-                        
-                        if retry_count >= max_retries:
-                            # Log failed records for data recovery
-                            logger.error(f"[{self.name}] Failed to insert after {max_retries} attempts")
-                            self._log_failed_records(table_type, data, errors)
-                        else:
-                            # Exponential backoff
-                            await asyncio.sleep(2 ** retry_count)
-                
-                except Exception as e:
-                    logger.error(f"[{self.name}] Error in BigQuery insertion: {str(e)}")
-                    retry_count += 1
-                    
-                    if retry_count >= max_retries:
-                        logger.error(f"[{self.name}] Failed to insert after {max_retries} attempts")
-                        self._log_failed_records(table_type, data, str(e))
-                        break
-                    
-                    # Exponential backoff
-                    await asyncio.sleep(2 ** retry_count)
+            # Chunks are inserted concurrently, bounded by the agent's semaphore
+            await asyncio.gather(*(
+                self._insert_chunk(table_type, table_id, chunk)
+                for chunk in self._iter_chunks(data, max_rows, max_bytes)
+            ))
             
         except Exception as e:
-            logger.error(f"[{self.name}] Error streaming to BigQuery: {str(e)}")
-            
-    def _log_failed_records(self, table_type: str, data: List[Dict[str, Any]], error_details: Any):
-        """Log failed records for data recovery."""
+            logger.error(f"[{name}] Error streaming to BigQuery: {str(e)}")
+
+    async def _run_insert(self, table_type: str, table_id: str,
+                          rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run a blocking insert on the BigQuery thread pool, bounded by the insert semaphore."""
+        async with self._insert_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._bq_executor, self._insert_rows, table_type, table_id, rows)
+
+    async def _enqueue(self, table_type: str, row: Dict[str, Any], message: Any = None) -> bool:
+        """
+        Queue a row for the next batched write into its table.
+        
+        Tables configured for load jobs are buffered for longer and written
+        with a load job; all others are micro-batched for streaming inserts.
+        The Pub/Sub message the row came from, if any, is acked after the
+        batch is written. Returns False, without queueing, while the table's
+        buffer is above the high-water mark so the caller can nack the message.
+        """
+        use_load_job = table_type in self._load_job_tables
+        # The message payload is a close enough size estimate and is already in
+        # memory; only rows without one are serialized just to be measured
+        row_bytes = len(message.data) if message is not None else len(_dumps_bytes(row))
+        async with self._pending_lock:
+            if self._pending_bytes[table_type] + row_bytes > self._pending_high_water:
+                return False
+            self._pending_bytes[table_type] += row_bytes
+            if use_load_job:
+                pending = self._load_pending[table_type]
+                pending_messages = self._load_pending_messages
+                self._load_started.setdefault(table_type, time.monotonic())
+                max_rows = self._load_batch_rows
+            else:
+                pending = self._pending[table_type]
+                pending_messages = self._pending_messages
+                max_rows = self._batch_max_rows
+            pending.append(row)
+            if message is not None:
+                pending_messages[table_type].append(message)
+            batch_full = len(pending) >= max_rows
+        
+        if batch_full:
+            # Flush a full batch right away instead of waiting for the flush loop
+            flush = self._flush_load_job(table_type) if use_load_job else self._flush_table(table_type)
+            task = asyncio.create_task(flush)
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        return True
+
+    @staticmethod
+    async def _write_then_ack(write, messages: List[Any]) -> None:
+        """
+        Await a batch write, then ack the messages behind its rows.
+        
+        Failed rows are dead-lettered by the write itself, so only an
+        interrupted write (cancellation) nacks them for redelivery.
+        """
+        try:
+            await write
+        except BaseException:
+            for message in messages:
+                message.nack()
+            raise
+        for message in messages:
+            message.ack()
+
+    async def _flush_table(self, table_type: str) -> None:
+        """Stream the pending rows of one table to BigQuery."""
+        async with self._pending_lock:
+            rows = self._pending.pop(table_type, None)
+            messages = self._pending_messages.pop(table_type, [])
+            self._pending_bytes.pop(table_type, None)
+        if rows:
+            await self._write_then_ack(self._stream_to_bigquery(table_type, rows), messages)
+
+    async def _flush_pending(self) -> None:
+        """Stream the pending rows of every table to BigQuery concurrently."""
+        async with self._pending_lock:
+            snapshot, self._pending = self._pending, defaultdict(list)
+            messages, self._pending_messages = self._pending_messages, defaultdict(list)
+            for table_type in snapshot:
+                self._pending_bytes.pop(table_type, None)
+        # Inserts across tables share the agent's insert semaphore
+        await asyncio.gather(*(
+            self._write_then_ack(self._stream_to_bigquery(table_type, rows), messages.get(table_type, []))
+            for table_type, rows in snapshot.items() if rows
+        ))
+
+    async def _flush_load_job(self, table_type: str) -> None:
+        """Write the load-job buffer of one table to BigQuery."""
+        async with self._pending_lock:
+            rows = self._load_pending.pop(table_type, None)
+            messages = self._load_pending_messages.pop(table_type, [])
+            self._load_started.pop(table_type, None)
+            self._pending_bytes.pop(table_type, None)
+        if rows:
+            await self._write_then_ack(self._load_rows(table_type, rows), messages)
+
+    async def _flush_load_jobs(self, due_only: bool = True) -> None:
+        """Write load-job buffers, by default only those older than the load interval."""
+        now = time.monotonic()
+        table_types = [
+            table_type for table_type, started in list(self._load_started.items())
+            if not due_only or now - started >= self._load_interval
+        ]
+        if table_types:
+            await asyncio.gather(*(self._flush_load_job(table_type) for table_type in table_types))
+
+    async def _flush_loop(self) -> None:
+        """Periodically flush batched rows; drains what is left on cancellation."""
+        interval = self._batch_max_latency_ms / 1000
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await self._flush_pending()
+                await self._flush_load_jobs()
+        except asyncio.CancelledError:
+            await self._flush_pending()
+            await self._flush_load_jobs(due_only=False)
+            raise
+
+    def _load_rows_blocking(self, table_type: str, table_id: str, rows: List[Dict[str, Any]]) -> None:
+        """Append rows with a newline-delimited JSON load job and wait for it (blocking)."""
+        # JSON columns are streamed as encoded strings but loaded as JSON values
+        json_fields = [field.name for field in SCHEMAS_BY_TABLE_TYPE.get(table_type, ())
+                       if field.field_type == "JSON"]
+        buffer = io.BytesIO()
+        for row in rows:
+            for field_name in json_fields:
+                value = row.get(field_name)
+                if isinstance(value, str):
+                    row = {**row, field_name: _loads(value)}
+            buffer.write(_dumps_bytes(row))
+            buffer.write(b"\n")
+        buffer.seek(0)
+        
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+        )
+        self._bq_client.load_table_from_file(buffer, table_id, job_config=job_config).result()
+
+    async def _load_rows(self, table_type: str, rows: List[Dict[str, Any]]) -> None:
+        """Write rows to BigQuery with a batch load job instead of streaming inserts."""
+        name = self.name
+        table_id = self._table_ids.get(table_type)
+        if table_id is None:
+            logger.warning(f"[{name}] Unknown table type: {table_type}")
+            return
+        
         try:
-            # Create a timestamped filename for failed records
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"failed_{table_type}_{timestamp}.json"
+            await asyncio.get_running_loop().run_in_executor(
+                self._bq_executor, self._load_rows_blocking, table_type, table_id, rows)
+            logger.info(f"[{name}] Loaded {len(rows)} records into {table_id}")
+            self._total_records_processed += len(rows)
+        except Exception as e:
+            logger.error(f"[{name}] BigQuery load job failed: {str(e)}")
+            await self._log_failed_records(table_type, rows, str(e))
+
+    @staticmethod
+    def _is_payload_too_large(error: Exception) -> bool:
+        """Whether an insert failed because the request body exceeded BigQuery's limit."""
+        if getattr(error, "code", None) == 413:
+            return True
+        message = str(error).lower()
+        return isinstance(error, api_exceptions.BadRequest) and (
+            "payload size" in message or "too large" in message)
+
+    async def _insert_chunk(self, table_type: str, table_id: str, chunk: List[Dict[str, Any]]):
+        """
+        Insert a single chunk of rows into BigQuery with retries.
+        
+        Transient failures (429/5xx, network errors) are retried with
+        exponential backoff plus jitter. Oversized requests are split in half
+        and each half inserted separately. Row-level and other 4xx errors are
+        permanent and go straight to the recovery log.
+        """
+        name = self.name
+        run_insert = self._run_insert
+        max_retries = 3
+        retry_count = 0
+        
+        while True:
+            try:
+                # Stream data to BigQuery off the event loop (without adding processed_at as it's not in schema)
+                errors = await run_insert(table_type, table_id, chunk)
+                
+                if not errors:
+                    logger.info(f"[{name}] Successfully streamed {len(chunk)} records to {table_id}")
+                    self._total_records_processed += len(chunk)
+                else:
+                    # Row-level errors (schema/type mismatches) will not succeed on retry
+                    logger.error(f"[{name}] BigQuery insert errors: {errors}")
+                    await self._log_failed_records(table_type, chunk, errors)
+                return
             
+            except Exception as e:
+                if self._is_payload_too_large(e) and len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    logger.warning(f"[{name}] Insert of {len(chunk)} rows too large, splitting")
+                    await self._insert_chunk(table_type, table_id, chunk[:middle])
+                    await self._insert_chunk(table_type, table_id, chunk[middle:])
+                    return
+                
+                if not _is_retryable(e):
+                    logger.error(f"[{name}] Permanent BigQuery insertion error: {str(e)}")
+                    await self._log_failed_records(table_type, chunk, str(e))
+                    return
+                
+                retry_count += 1
+                if retry_count >= max_retries:
+                    logger.error(f"[{name}] Failed to insert after {max_retries} attempts: {str(e)}")
+                    await self._log_failed_records(table_type, chunk, str(e))
+                    return
+                
+                # Exponential backoff with jitter
+                delay = _backoff_delay(retry_count)
+                logger.warning(f"[{name}] Transient BigQuery error, retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+            
+    def _append_recovery_record(self, table_type: str, error_data: Dict[str, Any]) -> str:
+        """Append one NDJSON record to the table's recovery file (recovery I/O thread only)."""
+        handle = self._recovery_files.get(table_type)
+        if handle is None:
+            os.makedirs(RECOVERY_DIR, exist_ok=True)
+            handle = open(os.path.join(RECOVERY_DIR, f"{table_type}.ndjson"), "ab")
+            self._recovery_files[table_type] = handle
+        handle.write(_dumps_bytes(error_data) + b"\n")
+        handle.flush()
+        return handle.name
+
+    def _close_recovery_files(self) -> None:
+        """Close the recovery file handles (recovery I/O thread only)."""
+        for handle in self._recovery_files.values():
+            handle.close()
+        self._recovery_files.clear()
+
+    def _write_recovery_fallback(self, table_type: str, error_data: Dict[str, Any]) -> None:
+        """Queue a local recovery-file append after a dead-letter publish failed."""
+        try:
+            self._io_executor.submit(self._append_recovery_record, table_type, error_data)
+        except RuntimeError:
+            logger.error(f"[{self.name}] Recovery writer stopped; dropped {len(error_data['records'])} {table_type} records")
+
+    async def _log_failed_records(self, table_type: str, data: List[Dict[str, Any]], error_details: Any):
+        """Send failed records to the dead-letter topic for later recovery."""
+        try:
             # Prepare the error log with metadata and log it properly
             error_data = {
                 "table_type": table_type,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "error_details": str(error_details),
                 "records": data
             }
+            payload = _dumps_bytes(error_data)
+            
+            # Split oversized batches so each dead-letter message fits in Pub/Sub
+            if len(payload) > DLQ_MAX_MESSAGE_BYTES:
+                if len(data) > 1:
+                    middle = len(data) // 2
+                    await self._log_failed_records(table_type, data[:middle], error_details)
+                    await self._log_failed_records(table_type, data[middle:], error_details)
+                else:
+                    logger.error(f"[{self.name}] Failed {table_type} record too large for dead-letter topic, writing recovery file")
+                    self._write_recovery_fallback(table_type, error_data)
+                return
             
-            # In production, write error logs to Cloud Storage
+            # Publish to the dead-letter topic without waiting on the result; the
+            # local recovery file is only a fallback when publishing fails
+            # (including when publisher flow control is exhausted)
             try:
-                # Save error data to a local recovery file for debugging
-                with open(f"recovery/{filename}", "w") as f:
-                    f.write(json.dumps(error_data))
-                logger.info(f"[{self.name}] Error data saved to recovery/{filename}")
-            except Exception as write_error:
-                # If file write fails, just log the error
-                logger.error(f"[{self.name}] Could not write recovery file: {str(write_error)}")
-            
-            # In production, these could be written to a specific GCS bucket
-            # or a dead-letter queue for later recovery
-            logger.error(f"[{self.name}] Failed records logged to recovery system: {filename}")
+                publish_future = self._publisher.publish(
+                    self._dlq_topic_path, payload, table_type=table_type)
+                
+                def on_published(future, table_type=table_type, error_data=error_data):
+                    if future.exception() is not None:
+                        logger.error(f"[{self.name}] Dead-letter publish failed: {future.exception()}")
+                        self._write_recovery_fallback(table_type, error_data)
+                
+                publish_future.add_done_callback(on_published)
+            except Exception as publish_error:
+                logger.error(f"[{self.name}] Could not publish to dead-letter topic: {str(publish_error)}")
+                self._write_recovery_fallback(table_type, error_data)
+            
+            logger.error(f"[{self.name}] {len(data)} failed {table_type} records sent to dead-letter topic")
             
             # For demo, log the first record to help with debugging
             if data and len(data) > 0:
-                logger.error(f"[{self.name}] Sample failed record: {json.dumps(data[0])[:200]}...")
+                logger.error(f"[{self.name}] Sample failed record: {_preview(data[0])}...")
         
         except Exception as e:
             logger.error(f"[{self.name}] Error logging failed records: {str(e)}")
 
-    async def _store_report(self, report_data: Dict[str, Any]):
-        """Store generated report in BigQuery."""
+    async def _store_report(self, report_data: Dict[str, Any]) -> Optional[bytes]:
+        """Store generated report in BigQuery and return the serialized report."""
+        summary_bytes = None
         try:
-            table_name = self._reporting_config['tables']['reports']
-            table_id = f"{self._project_id}.{self._dataset_id}.{table_name}"
+            table_id = self._table_ids['reports']
             
             # Add generation timestamp and report ID if not present
             if 'generated_at' not in report_data:
-                report_data['generated_at'] = datetime.now().isoformat()
+                report_data['generated_at'] = datetime.now(timezone.utc).isoformat()
                 
             if 'report_id' not in report_data:
                 report_type = report_data.get('report_type', 'unknown')
-                timestamp = int(datetime.now().timestamp())
+                timestamp = int(time.time())
                 report_data['report_id'] = f"REPORT_{report_type}_{timestamp}"
             
+            # Serialize the complete report once so publishing can splice it in
+            summary_bytes = _dumps_bytes(report_data)
+            
             # Structure data to match BigQuery schema
             # The reports table expects: report_id, report_type, report_period, metrics (JSON), insights, recommendations, etc.
             structured_report = {
@@ -745,42 +1799,19 @@ class ReportingAgent(BaseAgent):
             }
             
             # Create metrics JSON object with all the numeric data
-            metrics = {}
-            insights = []
-            recommendations = []
-            
-            if report_data['report_type'] == 'daily_summary':
-                metrics = {
-                    "total_transactions": report_data.get('total_transactions', 0),
-                    "high_risk_count": report_data.get('high_risk_count', 0),
-                    "medium_risk_count": report_data.get('medium_risk_count', 0),
-                    "low_risk_count": report_data.get('low_risk_count', 0),
-                    "avg_risk_score": report_data.get('avg_risk_score', 0.0),
-                    "avg_processing_time": report_data.get('avg_processing_time', 0.0),
-                    "fraud_detection_rate": report_data.get('fraud_detection_rate', 0.0),
-                    "false_positive_rate": report_data.get('false_positive_rate', 0.0)
-                }
-                insights = report_data.get('top_fraud_indicators', [])
-                recommendations = ["Monitor high-risk transactions", "Review detection thresholds"]
-                
-            elif report_data['report_type'] == 'weekly_trends':
-                metrics = {
-                    "trend_analysis": report_data.get('trend_analysis', {}),
-                }
-                insights = report_data.get('key_insights', [])
-                recommendations = report_data.get('recommendations', [])
-                
-            elif report_data['report_type'] == 'real_time_dashboard':
-                metrics = {
-                    "live_metrics": report_data.get('live_metrics', {}),
-                    "performance_indicators": report_data.get('performance_indicators', {})
-                }
-                insights = ["Real-time monitoring active"]
-                recommendations = ["Continue monitoring"]
+            build_report = _REPORT_BUILDERS.get(structured_report['report_type'])
+            if build_report is not None:
+                metrics, insights, recommendations = build_report(report_data)
+            else:
+                metrics, insights, recommendations = {}, [], []
+            
+            # Known numeric metrics go to typed columns, the rest stays JSON
+            metric_columns, residual_metrics = _split_typed_columns(metrics, _METRIC_COLUMN_NAMES)
+            structured_report.update(metric_columns)
             
             # Add structured data to report
             structured_report.update({
-                "metrics": json.dumps(metrics),
+                "metrics": _dumps(residual_metrics),
                 "insights": insights,
                 "recommendations": recommendations,
                 "data_quality_score": 0.95  # Default value
@@ -793,48 +1824,55 @@ class ReportingAgent(BaseAgent):
             while retry_count < max_retries:
                 try:
                     # Insert report into BigQuery
-                    errors = self._bq_client.insert_rows_json(table_id, [structured_report])
+                    errors = await self._run_insert('reports', table_id, [structured_report])
                     
                     if not errors:
                         logger.info(f"[{self.name}] Successfully stored report: {structured_report['report_type']} (ID: {structured_report['report_id']})")
                         self._total_reports_generated += 1
                         break
                     else:
+                        # Row-level errors (schema/type mismatches) will not succeed on retry
                         logger.error(f"[{self.name}] Error storing report: {errors}")
-                        retry_count += 1
-                        
-                        if retry_count >= max_retries:
-                            logger.error(f"[{self.name}] Failed to store report after {max_retries} attempts")
-                        else:
-                            # Exponential backoff
-                            await asyncio.sleep(2 ** retry_count)
+                        break
                 
                 except Exception as e:
                     logger.error(f"[{self.name}] Error in BigQuery report insertion: {str(e)}")
+                    if not _is_retryable(e):
+                        break
                     retry_count += 1
                     
                     if retry_count >= max_retries:
                         logger.error(f"[{self.name}] Failed to store report after {max_retries} attempts")
                         break
                     
-                    # Exponential backoff
-                    await asyncio.sleep(2 ** retry_count)
+                    # Exponential backoff with jitter
+                    await asyncio.sleep(_backoff_delay(retry_count))
             
         except Exception as e:
             logger.error(f"[{self.name}] Error storing report: {str(e)}")
+        
+        return summary_bytes
 
-    async def _publish_reports(self, report_data: Dict[str, Any]):
-        """Publish reports to Pub/Sub for downstream consumers."""
+    async def _publish_reports(self, report_data: Dict[str, Any], summary_bytes: Optional[bytes] = None):
+        """Publish reports to Pub/Sub for downstream consumers.
+
+        ``summary_bytes`` is the report as serialized by ``_store_report``;
+        the report is serialized here when it is not given.
+        """
         try:
-            # Add metadata for tracing and monitoring
-            message_data = json.dumps({
+            report_id = report_data.get("report_id")
+            if summary_bytes is None:
+                summary_bytes = _dumps_bytes(report_data)
+            
+            # Add metadata for tracing and monitoring; the summary is spliced in as raw JSON
+            envelope = _dumps_bytes({
                 "report_type": report_data.get("report_type", "unknown"),
-                "report_id": report_data.get("report_id", f"REPORT_{int(datetime.now().timestamp())}"),
-                "timestamp": datetime.now().isoformat(),
+                "report_id": report_id or f"REPORT_{int(time.time())}",
+                "timestamp": _now_iso(),
                 "source": self.name,
-                "environment": os.environ.get("ENVIRONMENT", "development"),
-                "summary": report_data
-            }).encode('utf-8')
+                "environment": self._environment or "development",
+            })
+            message_data = envelope[:-1] + b',"summary":' + summary_bytes + b'}'
             
             # Add message attributes for filtering (using correct Pub/Sub API)
             message_attributes = {
@@ -855,22 +1893,26 @@ class ReportingAgent(BaseAgent):
                         **message_attributes  # Pass attributes directly as keyword arguments
                     )
                     
-                    # Wait for the publish operation to complete
-                    message_id = publish_future.result(timeout=30)
+                    # Wait for the publish operation without blocking the event loop
+                    message_id = await asyncio.wait_for(
+                        asyncio.wrap_future(publish_future), timeout=PUBLISH_TIMEOUT_SECONDS)
                     
                     logger.info(f"📡 [{self.name}] Published {report_data.get('report_type')} report to fraud-reports topic, message ID: {message_id}")
                     break
                     
                 except Exception as e:
                     logger.error(f"[{self.name}] Error publishing report: {str(e)}")
+                    # Flow control is exhausted while outstanding messages drain
+                    if not (_is_retryable(e) or isinstance(e, FlowControlLimitError)):
+                        break
                     retry_count += 1
                     
                     if retry_count >= max_retries:
                         logger.error(f"[{self.name}] Failed to publish report after {max_retries} attempts")
                         break
                     
-                    # Exponential backoff
-                    await asyncio.sleep(2 ** retry_count)
+                    # Exponential backoff with jitter
+                    await asyncio.sleep(_backoff_delay(retry_count))
             
         except Exception as e:
             logger.error(f"[{self.name}] Error preparing report for publishing: {str(e)}")
@@ -893,176 +1935,210 @@ class ReportingAgent(BaseAgent):
             logger.error(f"[{self.name}] Error calculating data quality: {str(e)}")
             return 0.0
 
+    def _mark_subscription_ready(self) -> None:
+        """Count a subscription as settled; release the workflow once all have."""
+        if self._subscriptions_ready is None:
+            return
+        self._ready_count += 1
+        if self._ready_count >= len(self._subscription_paths):
+            self._subscriptions_ready.set()
+
+    @staticmethod
+    def _wait_for_streaming_pull(streaming_pull_future) -> None:
+        """Block until a cancelled streaming pull has shut down."""
+        try:
+            streaming_pull_future.result()
+        except Exception:
+            pass  # A cancelled pull raises on result(); shutdown is all we wait for
+
+    async def stop(self) -> None:
+        """Stop the subscriptions, flush pending rows and release BigQuery resources."""
+        # Write what is buffered while the subscriptions can still deliver its
+        # acks; rows that arrive after this are drained below, and their
+        # messages may be redelivered if the acks no longer reach Pub/Sub
+        await self._flush_pending()
+        await self._flush_load_jobs(due_only=False)
+        
+        self._stop.set()
+        
+        if self._subscription_tasks:
+            await asyncio.gather(*self._subscription_tasks, return_exceptions=True)
+            self._subscription_tasks = []
+        
+        # Cancelling the flush loop drains whatever is still buffered
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        
+        # Flush the publisher before the recovery writer goes away: a failed
+        # dead-letter publish falls back to a recovery file on that executor
+        if not self._clients_released:
+            self._clients_released = True
+            await asyncio.to_thread(_release_pubsub_clients)
+        
+        # Closing streams and joining executor threads blocks, so it runs off the loop
+        if self._storage_writer is not None:
+            await asyncio.to_thread(self._storage_writer.close)
+        await asyncio.to_thread(self._bq_executor.shutdown, True)
+        await asyncio.get_running_loop().run_in_executor(self._io_executor, self._close_recovery_files)
+        await asyncio.to_thread(self._io_executor.shutdown, True)
+        logger.info(f"[{self.name}] Reporting agent stopped")
+
     async def _subscribe_to_pubsub(self, subscription_path: str, subscription_name: str) -> None:
         """Subscribe to a Pub/Sub topic and process incoming messages in real-time."""
         try:
-            # Configure flow control to avoid overwhelming the system
+            # Messages stay leased until their rows are written, so flow control
+            # must admit a full batch of the subscription's table; the lease
+            # outlives the longest buffering window (the load-job interval)
+            table_type = self._subscription_tables.get(subscription_name)
+            batch_rows = (self._load_batch_rows if table_type in self._load_job_tables
+                          else self._batch_max_rows)
             flow_control = pubsub_v1.types.FlowControl(
-                max_messages=100,      # Process up to 100 messages concurrently
-                max_bytes=10 * 1024 * 1024,  # 10 MB
-                max_lease_duration=300  # 5 minutes
+                max_messages=max(100, batch_rows),
+                max_bytes=self._pending_high_water,
+                max_lease_duration=max(300, 2 * self._load_interval)
             )
             
             logger.info(f"[{self.name}] Starting subscription to {subscription_name} at {subscription_path}")
             
-            # Create a callback function for processing messages
-            async def callback(message: pubsub_v1.subscriber.message.Message) -> None:
+            # Resolve the message handler once for this subscription
+            handler = self._message_handlers.get(subscription_name)
+            
+            # The subscriber invokes callbacks on its own threads, so messages
+            # are handed to this event loop for processing
+            loop = asyncio.get_running_loop()
+            
+            async def handle_message(message: pubsub_v1.subscriber.message.Message) -> None:
                 try:
-                    # Parse the message data
-                    data_str = message.data.decode('utf-8')
-                    data = json.loads(data_str)
+                    # Parse the message data (bytes are parsed without decoding first)
+                    data = _loads(message.data)
                     
                     # Log receipt of message
                     logger.info(f"[{self.name}] Received message from {subscription_name}: {message.message_id}")
                     
-                    # Process the message based on subscription type
-                    if subscription_name == 'analysis-results' or subscription_name == 'hybrid-analysis-results':
-                        # Stream analysis results to BigQuery
-                        await self._process_analysis_message(data)
-                    elif subscription_name == 'fraud-alerts':
-                        # Stream alert data to BigQuery
-                        await self._process_alert_message(data)
-                    elif subscription_name == 'monitoring-results':
-                        # Stream monitoring data to BigQuery
-                        await self._process_monitoring_message(data)
+                    # Process the message based on subscription type; the row's
+                    # batch acks the message once it is written to BigQuery
+                    if handler is not None:
+                        if await handler(data, message) is False:
+                            # Buffer above its high-water mark: let Pub/Sub redeliver later
+                            message.nack()
                     else:
                         logger.warning(f"[{self.name}] Unknown subscription type: {subscription_name}")
-                    
-                    # Acknowledge the message to remove from queue
-                    message.ack()
+                        message.ack()
                     
                 except Exception as e:
                     # Log error but don't acknowledge message to allow reprocessing
                     logger.error(f"[{self.name}] Error processing message from {subscription_name}: {str(e)}")
                     message.nack()
             
+            def callback(message: pubsub_v1.subscriber.message.Message) -> None:
+                asyncio.run_coroutine_threadsafe(handle_message(message), loop)
+            
             # Use the subscriber client to create a subscription
             streaming_pull_future = self._subscriber.subscribe(
                 subscription_path,
                 callback=callback,
                 flow_control=flow_control
             )
+            self._mark_subscription_ready()
             
-            # Block until the subscription is terminated or a timeout occurs (field-specific implementation)
+            # Keep the subscription alive until the agent is stopped
             try:
-                # Keep the subscription alive until the agent is stopped
-                await asyncio.Future()  # This will never complete, keeping the subscription active
-            except Exception as e:
-                logger.error(f"[{self.name}] Subscription to {subscription_name} terminated: {str(e)}")
+                await self._stop.wait()
+                logger.info(f"[{self.name}] Stopping subscription to {subscription_name}")
+            finally:
+                # Shut down the streaming pull and wait for its threads to exit
                 streaming_pull_future.cancel()
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._wait_for_streaming_pull, streaming_pull_future)
                 
         except Exception as e:
             logger.error(f"[{self.name}] Error setting up subscription to {subscription_name}: {str(e)}")
+            # A failed subscription should not hold up the workflow
+            self._mark_subscription_ready()
     
-    async def _process_analysis_message(self, data: Dict[str, Any]) -> None:
+    async def _process_analysis_message(self, data: Dict[str, Any], message: Any = None) -> bool:
         """Process an analysis result message from Pub/Sub."""
         try:
             # Extract relevant fields
-            analysis_result = {
-                "analysis_id": data.get("analysis_id", f"ANALYSIS_{int(datetime.now().timestamp())}"),
-                "transaction_id": data.get("transaction_id"),
-                "risk_score": data.get("risk_score"),
-                "risk_level": data.get("risk_level"),
-                "analysis_method": data.get("analysis_method"),
-                "analyzed_at": data.get("timestamp", datetime.now().isoformat())
-            }
+            get = data.get
+            analysis_result = {key: get(key) for key in ANALYSIS_MESSAGE_FIELDS}
+            analysis_result["analysis_id"] = analysis_result["analysis_id"] or f"ANALYSIS_{time.time_ns()}"
+            analysis_result["analyzed_at"] = get("timestamp") or datetime.now(timezone.utc).isoformat()
             
             # Add additional fields if present
-            if "fraud_indicators" in data:
-                analysis_result["fraud_indicators"] = data["fraud_indicators"]
-            if "recommendations" in data:
-                analysis_result["recommendations"] = data["recommendations"]
-            if "analysis_summary" in data:
-                analysis_result["analysis_summary"] = data["analysis_summary"]
-            if "confidence_score" in data:
-                analysis_result["confidence_score"] = data["confidence_score"]
-            if "processing_time_ms" in data:
-                analysis_result["processing_time_ms"] = data["processing_time_ms"]
-            
-            # Stream to BigQuery
-            await self._stream_to_bigquery('analysis_results', [analysis_result])
+            analysis_result.update((key, data[key]) for key in ANALYSIS_OPTIONAL_FIELDS if key in data)
+            
+            # Queue for the next batched insert into BigQuery
+            return await self._enqueue('analysis_results', analysis_result, message)
             
         except Exception as e:
             logger.error(f"[{self.name}] Error processing analysis message: {str(e)}")
+            return False
     
-    async def _process_alert_message(self, data: Dict[str, Any]) -> None:
+    async def _process_alert_message(self, data: Dict[str, Any], message: Any = None) -> bool:
         """Process an alert message from Pub/Sub."""
         try:
             # Extract relevant fields
+            get = data.get
             alert = {
-                "alert_id": data.get("alert_id", f"ALERT_{int(datetime.now().timestamp())}"),
-                "transaction_id": data.get("transaction_id"),
-                "priority": data.get("priority"),
-                "urgency": data.get("urgency"),
-                "alert_type": data.get("alert_type", "FRAUD_DETECTED"),
-                "notification_channels": data.get("notification_channels", []),
-                "alert_status": data.get("alert_status", "ACTIVE"),
-                "created_at": data.get("timestamp", datetime.now().isoformat())
+                "alert_id": get("alert_id") or f"ALERT_{time.time_ns()}",
+                "transaction_id": get("transaction_id"),
+                "priority": get("priority"),
+                "urgency": get("urgency"),
+                "alert_type": get("alert_type", "FRAUD_DETECTED"),
+                "notification_channels": get("notification_channels", []),
+                "alert_status": get("alert_status", "ACTIVE"),
+                "created_at": get("timestamp") or datetime.now(timezone.utc).isoformat()
             }
             
-            # Stream to BigQuery
-            await self._stream_to_bigquery('alerts', [alert])
+            # Queue for the next batched insert into BigQuery
+            return await self._enqueue('alerts', alert, message)
             
         except Exception as e:
             logger.error(f"[{self.name}] Error processing alert message: {str(e)}")
+            return False
     
-    async def _process_monitoring_message(self, data: Dict[str, Any]) -> None:
+    async def _process_monitoring_message(self, data: Dict[str, Any], message: Any = None) -> bool:
         """Process a monitoring message from Pub/Sub."""
         try:
             # Extract transaction data - this might be structured differently
             # depending on your monitoring agent output
+            # Model features (V1..V28) go to typed columns, the rest stays JSON
+            get = data.get
+            feature_columns, residual_features = _split_typed_columns(
+                get("features") or {}, FEATURE_COLUMNS)
+            now = datetime.now(timezone.utc).isoformat()
             transaction = {
-                "transaction_id": data.get("transaction_id"),
-                "timestamp": data.get("timestamp", datetime.now().isoformat()),
-                "amount": data.get("amount"),
-                "merchant": data.get("merchant"),
-                "location": data.get("location"),
-                "card_type": data.get("card_type"),
-                "features": json.dumps(data.get("features", {})),
-                "processed_at": datetime.now().isoformat()
+                "transaction_id": get("transaction_id"),
+                "timestamp": get("timestamp") or now,
+                "amount": get("amount"),
+                "merchant": get("merchant"),
+                "location": get("location"),
+                "card_type": get("card_type"),
+                "features": _dumps(residual_features),
+                "processed_at": now
             }
+            transaction.update(feature_columns)
             
-            # Stream to BigQuery
-            await self._stream_to_bigquery('transactions', [transaction])
+            # Queue for the next batched insert into BigQuery
+            return await self._enqueue('transactions', transaction, message)
             
         except Exception as e:
             logger.error(f"[{self.name}] Error processing monitoring message: {str(e)}")
+            return False
     
     def generate_looker_studio_config(self) -> Dict[str, Any]:
-        """Generate Looker Studio dashboard configuration."""
+        """Generate Looker Studio dashboard configuration (dashboard_config is shared; do not mutate)."""
         return {
             "data_source": {
                 "type": "bigquery",
                 "project_id": self._project_id,
                 "dataset_id": self._dataset_id
             },
-            "dashboard_config": {
-                "title": "Fraud Detection Analytics Dashboard",
-                "refresh_interval": "1 hour",
-                "charts": [
-                    {
-                        "type": "scorecard",
-                        "title": "Daily Transactions",
-                        "metric": "total_transactions"
-                    },
-                    {
-                        "type": "line_chart", 
-                        "title": "Fraud Rate Trend",
-                        "x_axis": "date",
-                        "y_axis": "fraud_rate"
-                    },
-                    {
-                        "type": "pie_chart",
-                        "title": "Risk Level Distribution",
-                        "dimension": "risk_level"
-                    },
-                    {
-                        "type": "bar_chart",
-                        "title": "Top Fraud Indicators",
-                        "dimension": "fraud_indicators"
-                    }
-                ]
-            }
+            "dashboard_config": LOOKER_DASHBOARD_CONFIG
         }
 
 # Test function for the Reporting Agent
@@ -8,12 +8,13 @@ Production-grade health monitoring API with comprehensive endpoints.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Depends, status, Request
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi.responses import PlainTextResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
@@ -26,6 +27,19 @@ from config.settings import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optional orjson for faster serialization of cached health responses
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Bursts of /health probes (several probers, load balancer fan-out) reuse the
+# last serialized response; the TTL stays short so each probe still sees fresh
+# health, while the system health is gathered at most once per second
+HEALTH_CACHE_TTL_SECONDS = 1.0
+
 # Pydantic models for API responses
 class HealthStatus(BaseModel):
     """Health status response model."""
@@ -114,6 +128,9 @@ class HealthCheckService:
         self.last_health_check = None
         self.health_history = []
         
+        # (monotonic time, serialized HealthStatus) of the last /health response
+        self._health_cache: Optional[Tuple[float, bytes]] = None
+        
         # Create FastAPI app with lifespan management
         @asynccontextmanager
         async def lifespan(app: FastAPI):
@@ -166,25 +183,27 @@ class HealthCheckService:
         async def root():
             return {"status": "ok", "service": "fraud-detection-backend"}
             
-        # Simple health check
-        @self.app.get("/health", include_in_schema=False)
-        async def health():
-            return {"status": "healthy"}
-            
         @self.app.get(
             "/health",
-            response_model=HealthStatus,
+            response_model=None,
+            responses={200: {"model": HealthStatus}},
             summary="Basic Health Check",
             description="Returns overall system health status"
         )
         async def health_check():
-            """Basic health check endpoint."""
+            """Basic health check endpoint; bursts of probes share one cached response."""
+            cached = self._health_cache
+            if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+                return Response(content=cached[1], media_type="application/json")
+            
             try:
                 health_status = await self._get_system_health()
                 self.last_health_check = datetime.utcnow()
                 self._update_health_history(health_status)
                 
-                return HealthStatus(**health_status)
+                body = _dumps(HealthStatus(**health_status).model_dump())
+                self._health_cache = (time.monotonic(), body)
+                return Response(content=body, media_type="application/json")
                 
             except Exception as e:
                 logger.error(f"Health check error: {e}")
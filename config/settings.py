@@ -82,6 +82,9 @@ class Settings:
         self.PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT", "fraud-detection-adkhackathon")
         self.ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
         
+        # API configuration
+        self.BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "32"))
+        
         # Initialize configuration objects
         self.pubsub = PubSubConfig(project_id=self.PROJECT_ID)
         self.bigquery = BigQueryConfig(project_id=self.PROJECT_ID)
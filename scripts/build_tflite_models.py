@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+TFLite Flagging Model Build Script
+
+Converts the Keras flagging model into the float16 and int8 TFLite variants
+the monitoring agent prefers at runtime. Conversion (and int8 calibration
+against models/creditcard.csv) takes seconds, so it runs here offline or as a
+deployment step instead of on the first monitored transaction.
+"""
+
+import csv
+import logging
+import os
+import sys
+
+import numpy as np
+import tensorflow as tf
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+MODEL_PATH = os.path.join(MODELS_DIR, "fraud_detection_model.keras")
+CSV_PATH = os.path.join(MODELS_DIR, "creditcard.csv")
+
+# Must match the suffixes agents/monitor_agent.py looks for
+TFLITE_INT8_SUFFIX = "_int8.tflite"
+TFLITE_FP16_SUFFIX = "_fp16.tflite"
+REPRESENTATIVE_SAMPLE_COUNT = 200
+
+def representative_dataset(csv_path: str):
+    """Yield non-fraud samples from the training CSV for int8 calibration."""
+    def generator():
+        yielded = 0
+        with open(csv_path, newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("Class", "").strip('"') != "0":
+                    continue
+                vector = [float(row[f"V{i}"]) for i in range(1, 29)]
+                vector.append(float(row["Amount"]) / 1000.0)
+                yield [np.array([vector], dtype=np.float32)]
+                yielded += 1
+                if yielded >= REPRESENTATIVE_SAMPLE_COUNT:
+                    break
+    return generator
+
+def build_tflite_models(model_path: str, csv_path: str, force: bool = False) -> None:
+    """Write int8 and float16 TFLite artifacts next to the Keras model."""
+    model = tf.keras.models.load_model(model_path)
+    base_path = os.path.splitext(model_path)[0]
+    
+    fp16_path = base_path + TFLITE_FP16_SUFFIX
+    if force or not os.path.exists(fp16_path):
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+        with open(fp16_path, "wb") as f:
+            f.write(converter.convert())
+        logger.info(f"Built float16 TFLite model: {fp16_path}")
+    
+    int8_path = base_path + TFLITE_INT8_SUFFIX
+    if not os.path.exists(csv_path):
+        logger.warning(f"Calibration data {csv_path} not found, skipping int8 model")
+    elif force or not os.path.exists(int8_path):
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset(csv_path)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        with open(int8_path, "wb") as f:
+            f.write(converter.convert())
+        logger.info(f"Built int8 TFLite model: {int8_path}")
+
+def main():
+    """Build the TFLite flagging models; pass --force to rebuild existing ones."""
+    if not os.path.exists(MODEL_PATH):
+        logger.error(f"Keras model not found: {MODEL_PATH}")
+        sys.exit(1)
+    
+    build_tflite_models(MODEL_PATH, CSV_PATH, force="--force" in sys.argv[1:])
+    logger.info("TFLite model build completed")
+
+if __name__ == "__main__":
+    main()
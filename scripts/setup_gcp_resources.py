@@ -28,7 +28,8 @@ def setup_pubsub_resources(project_id: str):
             "flagged-transactions", 
             "analysis-results",
             "hybrid-analysis-results",
-            "fraud-alerts"
+            "fraud-alerts",
+            "fraud-reports-dlq"
         ]
         
         subscriptions = [
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for the Fraud Detection API token cache and bulk analysis paths.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import fraud_api
+from api.fraud_api import FraudDetectionAPI, TokenCache, TransactionInput
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(fraud_api.time, "monotonic", fake_clock)
+    return fake_clock
+
+def _transactions(*amounts):
+    return [
+        TransactionInput(transaction_id=f"txn_{index}", amount=amount)
+        for index, amount in enumerate(amounts)
+    ]
+
+def _collect(stream):
+    async def collect():
+        return [line async for line in stream]
+    return asyncio.run(collect())
+
+# TokenCache
+
+def test_token_cache_returns_principal_until_ttl(clock):
+    cache = TokenCache(maxsize=4, ttl=60.0)
+    cache.set("token-a", {"sub": "a"})
+
+    clock.now += 59
+    assert cache.get("token-a") == {"sub": "a"}
+
+    clock.now += 1
+    assert cache.get("token-a") is None
+    # Expired entries are dropped, not just hidden
+    assert len(cache._entries) == 0
+
+def test_token_cache_evicts_least_recently_used(clock):
+    cache = TokenCache(maxsize=2, ttl=60.0)
+    cache.set("token-a", {"sub": "a"})
+    cache.set("token-b", {"sub": "b"})
+
+    # Reading token-a makes token-b the least recently used
+    assert cache.get("token-a") == {"sub": "a"}
+    cache.set("token-c", {"sub": "c"})
+
+    assert cache.get("token-b") is None
+    assert cache.get("token-a") == {"sub": "a"}
+    assert cache.get("token-c") == {"sub": "c"}
+
+def test_token_cache_does_not_store_raw_tokens(clock):
+    cache = TokenCache()
+    cache.set("secret-token", {"sub": "a"})
+
+    assert all(b"secret-token" not in key for key in cache._entries)
+
+def test_validate_auth_verifies_each_token_once(clock, monkeypatch):
+    api = FraudDetectionAPI()
+    calls = []
+
+    async def verify_token(token):
+        calls.append(token)
+        return {"sub": token}
+
+    monkeypatch.setattr(api, "_verify_token", verify_token)
+
+    async def validate_twice():
+        first = await api._validate_auth("token-a")
+        second = await api._validate_auth("token-a")
+        return first, second
+
+    assert asyncio.run(validate_twice()) == ({"sub": "token-a"}, {"sub": "token-a"})
+    assert calls == ["token-a"]
+
+# Bulk fallback
+
+def test_bulk_fallback_matches_single_transaction_rules():
+    api = FraudDetectionAPI()
+    results = api._process_bulk_fallback(_transactions(100, 10000, 10000.01))
+
+    assert [r.transaction_id for r in results] == ["txn_0", "txn_1", "txn_2"]
+    assert [r.risk_score for r in results] == [0.5, 0.5, 0.9]
+    assert [r.risk_level for r in results] == ["MEDIUM", "MEDIUM", "HIGH"]
+    assert [r.fraud_indicators for r in results] == [["medium_amount"], ["medium_amount"], ["large_amount"]]
+    assert [r.recommendations for r in results] == [["review_manually"], ["review_manually"], ["block_transaction"]]
+    assert len({r.analysis_id for r in results}) == 3
+
+def test_bulk_fallback_agrees_with_process_transaction():
+    api = FraudDetectionAPI()
+    transactions = _transactions(250, 15000)
+
+    bulk = api._process_bulk_fallback(transactions)
+
+    async def process_each():
+        return [await api._process_transaction(transaction) for transaction in transactions]
+
+    for batched, single in zip(bulk, asyncio.run(process_each())):
+        assert (batched.risk_score, batched.risk_level, batched.fraud_indicators, batched.recommendations) == \
+            (single.risk_score, single.risk_level, single.fraud_indicators, single.recommendations)
+
+# NDJSON bulk stream
+
+def test_stream_bulk_without_agents_yields_one_line_per_transaction():
+    api = FraudDetectionAPI()
+    lines = _collect(api._stream_bulk(_transactions(100, 20000)))
+
+    assert all(line.endswith(b"\n") and line.count(b"\n") == 1 for line in lines)
+    records = [json.loads(line) for line in lines]
+    assert [record["transaction_id"] for record in records] == ["txn_0", "txn_1"]
+    assert [record["risk_level"] for record in records] == ["MEDIUM", "HIGH"]
+
+class SlowHybridAgent:
+    """Hybrid agent whose analysis takes longer for smaller amounts."""
+
+    async def analyze_transaction(self, transaction):
+        await asyncio.sleep(0.05 * (4 - transaction["amount"]))
+        return {"risk_score": 0.5, "fraud_indicators": [], "recommendations": []}
+
+class FlagAllMonitor:
+    def process_transaction(self, transaction):
+        return {"flagged": True}
+
+class StubAlertAgent:
+    def process_alert(self, alert):
+        return {"sent": True}
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.agents = {
+            "monitor": FlagAllMonitor(),
+            "hybrid": SlowHybridAgent(),
+            "alert": StubAlertAgent(),
+        }
+
+def test_stream_bulk_with_agents_yields_in_completion_order():
+    api = FraudDetectionAPI(orchestrator=FakeOrchestrator())
+    lines = _collect(api._stream_bulk(_transactions(1, 2, 3)))
+
+    records = [json.loads(line) for line in lines]
+    assert [record["transaction_id"] for record in records] == ["txn_2", "txn_1", "txn_0"]
+    assert all(record["risk_level"] == "MEDIUM" for record in records)
+
+def test_stream_bulk_cancels_remaining_work_when_closed():
+    api = FraudDetectionAPI(orchestrator=FakeOrchestrator())
+
+    async def read_first_line():
+        stream = api._stream_bulk(_transactions(1, 2, 3))
+        first = await stream.__anext__()
+        await stream.aclose()
+        remaining = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await asyncio.gather(*remaining, return_exceptions=True)
+        return first, remaining
+
+    first, remaining = asyncio.run(read_first_line())
+    assert json.loads(first)["transaction_id"] == "txn_2"
+    # The slower analyses were cancelled rather than left to finish
+    assert len(remaining) == 2
+    assert all(task.cancelled() for task in remaining)
+
+def test_stream_route_is_not_gzipped_for_gzip_clients():
+    api = FraudDetectionAPI()
+    body = {"transactions": [
+        {"transaction_id": f"txn_{index}", "amount": 100 + index} for index in range(100)
+    ]}
+
+    with TestClient(api.app) as client:
+        with client.stream("POST", fraud_api.BULK_STREAM_PATH, json=body,
+                           headers={"Accept-Encoding": "gzip"}) as response:
+            assert response.status_code == 200
+            assert "content-encoding" not in response.headers
+            first_line = next(response.iter_lines())
+
+    assert json.loads(first_line)["transaction_id"] == "txn_0"
+
+def test_buffered_bulk_route_is_still_gzipped():
+    api = FraudDetectionAPI()
+    body = {"transactions": [
+        {"transaction_id": f"txn_{index}", "amount": 100 + index} for index in range(100)
+    ]}
+
+    with TestClient(api.app) as client:
+        response = client.post("/api/v1/analyze/bulk", json=body, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+# React index ETag
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+    ('"ab"', False),
+    ("", False),
+])
+def test_etag_matches_whole_tags_only(if_none_match, expected):
+    assert fraud_api._etag_matches(if_none_match, '"abc"') is expected
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the tiered rule flags of the Monitoring Agent.
+"""
+
+import pytest
+
+import monitor_agent
+from monitor_agent import flag_suspicious_transaction
+
+# Daytime timestamp, so no off-hours flag is added
+DAYTIME = "2024-01-15T10:30:00Z"
+
+@pytest.fixture(autouse=True)
+def rules_only(monkeypatch):
+    """Score with the rules alone, independent of TensorFlow and the model file."""
+    monkeypatch.setattr(monitor_agent, "ML_AVAILABLE", False)
+
+@pytest.mark.parametrize("amount, expected_flag, expected_score", [
+    (0, None, 0.0),
+    (5000, None, 0.0),
+    (5000.01, "Elevated transaction amount", 0.2),
+    (10000, "Elevated transaction amount", 0.2),
+    (10000.01, "High transaction amount", 0.3),
+])
+def test_amount_tiers(amount, expected_flag, expected_score):
+    result = flag_suspicious_transaction({"amount": amount, "timestamp": DAYTIME})
+
+    assert result["risk_flags"] == ([expected_flag] if expected_flag else [])
+    assert result["risk_score"] == pytest.approx(expected_score)
+
+@pytest.mark.parametrize("extreme_count, expected_flag, expected_score", [
+    (0, None, 0.0),
+    (2, None, 0.0),
+    (3, "Some extreme feature values", 0.2),
+    (5, "Some extreme feature values", 0.2),
+    (6, "Multiple extreme feature values", 0.4),
+])
+def test_extreme_feature_tiers(extreme_count, expected_flag, expected_score):
+    features = {f"V{i}": 3.5 for i in range(1, extreme_count + 1)}
+    features["V28"] = 0.1
+    result = flag_suspicious_transaction({"amount": 10, "timestamp": DAYTIME, "features": features})
+
+    assert result["risk_flags"] == ([expected_flag] if expected_flag else [])
+    assert result["risk_score"] == pytest.approx(expected_score)
+
+def test_extreme_features_ignore_non_numeric_and_boundary_values():
+    features = {"V1": 3, "V2": -3, "V3": "99", "V4": None, "V5": 3.01, "V6": -4}
+    result = flag_suspicious_transaction({"amount": 10, "timestamp": DAYTIME, "features": features})
+
+    # Only V5 and V6 exceed |3|, which stays below the first tier
+    assert result["risk_flags"] == []
+
+def test_combined_tiers_flag_transaction():
+    features = {f"V{i}": -5.0 for i in range(1, 7)}
+    result = flag_suspicious_transaction({"amount": 12000, "timestamp": DAYTIME, "features": features})
+
+    assert result["risk_flags"] == ["High transaction amount", "Multiple extreme feature values"]
+    assert result["risk_score"] == pytest.approx(0.7)
+    assert result["flagged"] is True
+    assert result["flagging_method"] == "rule_based"
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the Reporting Agent's row micro-batching, insert chunking and log previews.
+"""
+
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+
+import reporting_agent
+from reporting_agent import ReportingAgent, _dumps_bytes, _preview
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Agent in development mode with the Google Cloud clients stubbed out."""
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    monkeypatch.setattr(reporting_agent.bigquery, "Client", mock.MagicMock())
+    monkeypatch.setattr(reporting_agent, "_acquire_pubsub_clients",
+                        mock.MagicMock(return_value=(mock.MagicMock(), mock.MagicMock())))
+    return ReportingAgent(name="TestReportingAgent", project_id="test-project")
+
+@pytest.fixture
+def streamed(agent, monkeypatch):
+    """(table_type, rows) of every batch handed to _stream_to_bigquery."""
+    calls = []
+
+    async def record(table_type, rows):
+        calls.append((table_type, list(rows)))
+
+    monkeypatch.setattr(agent, "_stream_to_bigquery", record)
+    return calls
+
+def _alert(index):
+    return {"alert_id": f"ALERT_{index}", "priority": "HIGH"}
+
+# Micro-batcher
+
+def test_full_batch_is_flushed_immediately(agent, streamed):
+    agent._batch_max_rows = 3
+
+    async def enqueue_batch():
+        accepted = [await agent._enqueue("alerts", _alert(i)) for i in range(3)]
+        await asyncio.gather(*list(agent._flush_tasks))
+        return accepted
+
+    assert asyncio.run(enqueue_batch()) == [True, True, True]
+    assert streamed == [("alerts", [_alert(0), _alert(1), _alert(2)])]
+    assert agent._pending_bytes["alerts"] == 0
+
+def test_partial_batch_waits_for_periodic_flush(agent, streamed):
+    agent._batch_max_rows = 3
+
+    async def enqueue_partial_batch():
+        for i in range(2):
+            await agent._enqueue("alerts", _alert(i))
+        assert not agent._flush_tasks
+        assert streamed == []
+        await agent._flush_pending()
+
+    asyncio.run(enqueue_partial_batch())
+    assert streamed == [("alerts", [_alert(0), _alert(1)])]
+
+def test_enqueue_rejects_rows_above_high_water_mark(agent, streamed):
+    agent._pending_high_water = 2 * len(_dumps_bytes(_alert(0)))
+
+    async def enqueue_past_high_water():
+        accepted = [await agent._enqueue("alerts", _alert(i)) for i in range(3)]
+        # Flushing frees the buffer, so rows are accepted again
+        await agent._flush_pending()
+        accepted.append(await agent._enqueue("alerts", _alert(3)))
+        return accepted
+
+    assert asyncio.run(enqueue_past_high_water()) == [True, True, False, True]
+    assert streamed == [("alerts", [_alert(0), _alert(1)])]
+
+def test_messages_are_acked_only_after_their_batch_is_written(agent, streamed):
+    messages = [mock.MagicMock(), mock.MagicMock()]
+
+    async def enqueue_and_flush():
+        for i, message in enumerate(messages):
+            await agent._enqueue("alerts", _alert(i), message)
+        assert not any(message.ack.called for message in messages)
+        await agent._flush_pending()
+
+    asyncio.run(enqueue_and_flush())
+    assert streamed == [("alerts", [_alert(0), _alert(1)])]
+    assert all(message.ack.call_count == 1 for message in messages)
+    assert not any(message.nack.called for message in messages)
+
+def test_interrupted_write_nacks_its_messages(agent, monkeypatch):
+    message = mock.MagicMock()
+
+    async def interrupted(table_type, rows):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(agent, "_stream_to_bigquery", interrupted)
+
+    async def enqueue_and_flush():
+        await agent._enqueue("alerts", _alert(0), message)
+        with pytest.raises(asyncio.CancelledError):
+            await agent._flush_table("alerts")
+
+    asyncio.run(enqueue_and_flush())
+    message.nack.assert_called_once_with()
+    assert not message.ack.called
+
+def test_load_job_tables_are_not_streamed(agent, streamed):
+    async def enqueue_transaction():
+        await agent._enqueue("transactions", {"transaction_id": "txn_1"})
+        await agent._flush_pending()
+
+    asyncio.run(enqueue_transaction())
+    assert streamed == []
+    assert agent._load_pending["transactions"] == [{"transaction_id": "txn_1"}]
+
+# Insert chunking
+
+def _rows(count):
+    return [{"id": index, "payload": "x" * 20} for index in range(count)]
+
+def test_chunks_are_bounded_by_row_count():
+    chunks = list(ReportingAgent._iter_chunks(_rows(7), max_rows=3, max_bytes=10**6))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [row for chunk in chunks for row in chunk] == _rows(7)
+
+def test_chunks_are_bounded_by_serialized_size():
+    row_bytes = len(_dumps_bytes(_rows(1)[0]))
+    chunks = list(ReportingAgent._iter_chunks(_rows(5), max_rows=100, max_bytes=2 * row_bytes))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+def test_oversized_row_gets_its_own_chunk():
+    rows = [{"id": 0}, {"id": 1, "payload": "x" * 1000}, {"id": 2}]
+    chunks = list(ReportingAgent._iter_chunks(rows, max_rows=100, max_bytes=100))
+
+    assert chunks == [[rows[0]], [rows[1]], [rows[2]]]
+
+def test_no_rows_yield_no_chunks():
+    assert list(ReportingAgent._iter_chunks([], max_rows=10, max_bytes=100)) == []
+
+# Log previews
+
+def test_preview_of_small_dict_is_complete_json():
+    record = {"transaction_id": "txn_1", "amount": 12.5}
+
+    assert json.loads(_preview(record)) == record
+
+def test_preview_of_large_dict_is_cut_to_limit():
+    record = {f"V{i}": i * 1.5 for i in range(1, 500)}
+    preview = _preview(record, limit=200)
+
+    assert len(preview) <= 200
+    assert preview.startswith('{"V1":1.5,"V2":3.0')
+
+def test_preview_cuts_long_strings_before_serializing():
+    preview = _preview({"blob": "x" * 10_000}, limit=50)
+
+    assert len(preview) == 50
+    assert preview.startswith('{"blob":"xxx')
+
+def test_preview_of_non_dict_is_truncated_json():
+    values = list(range(100))
+
+    assert _preview(values, limit=10) == _dumps_bytes(values).decode()[:10]